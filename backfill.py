@@ -0,0 +1,155 @@
+"""
+Выгрузка полной истории работ пользователей в JSONL.
+
+Пример:
+    python backfill.py --output history.jsonl --from-date 0
+"""
+import argparse
+import itertools
+import json
+import logging
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from constants import (API_CONNECT_TIMEOUT, API_READ_TIMEOUT, ENDPOINT,
+                       MAX_IN_FLIGHT, PRACTICUM_TOKEN, TELEGRAM_CHAT_ID,
+                       TENANTS_FILE)
+from homework import check_get_api, check_response
+from poller import Tenant, load_tenants
+from retry import call_with_retry
+from status_index import StatusIndex, homework_key
+
+
+def fetch_history(endpoint, tenant, from_date):
+    """Все работы пользователя, изменившиеся после from_date."""
+    params = dict(
+        headers=tenant.headers,
+        params={'from_date': from_date},
+        timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT)
+    )
+    return check_response(call_with_retry(check_get_api, endpoint, params))
+
+
+def iter_histories(tenants, from_date=0, endpoint=ENDPOINT,
+                   max_in_flight=MAX_IN_FLIGHT, failed=None):
+    """
+    Пары (пользователь, работы) по мере получения ответов,.
+    в памяти одновременно не больше max_in_flight ответов.
+    """
+    tenants = iter(tenants)
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        pending = {}
+
+        def submit(batch):
+            for tenant in batch:
+                future = executor.submit(
+                    fetch_history, endpoint, tenant, from_date
+                )
+                pending[future] = tenant
+
+        submit(itertools.islice(tenants, max_in_flight))
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                tenant = pending.pop(future)
+                submit(itertools.islice(tenants, 1))
+                try:
+                    homeworks = future.result()
+                except Exception as error:
+                    logging.error(f'История {tenant.key} не получена: {error}')
+                    if failed is not None:
+                        failed.append(tenant.key)
+                    continue
+                yield tenant, homeworks
+
+
+def iter_records(histories):
+    """Пары (ключ пользователя, работа) по одной на работу."""
+    for tenant, homeworks in histories:
+        for homework in homeworks:
+            if homework.key is None:
+                logging.warning(f'Пропущена работа {tenant.key}: {homework}')
+                continue
+            yield tenant.key, homework
+
+
+def write_jsonl(records, file, statuses=None):
+    """Записать записи построчно, при statuses - запомнить их статусы."""
+    count = 0
+    for tenant, homework in records:
+        record = {'tenant': tenant, **homework.as_dict()}
+        file.write(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+            + '\n'
+        )
+        if statuses is not None and homework.status:
+            statuses.remember(homework_key(tenant, homework), homework.status)
+        count += 1
+    return count
+
+
+def backfill(tenants, file, from_date=0, endpoint=ENDPOINT,
+             max_in_flight=MAX_IN_FLIGHT, statuses=None):
+    """Выгрузить историю пользователей в file, вернуть итоги."""
+    started = time.monotonic()
+    failed = []
+    histories = iter_histories(
+        tenants, from_date, endpoint, max_in_flight, failed
+    )
+    count = write_jsonl(iter_records(histories), file, statuses)
+    if statuses is not None and statuses.path:
+        statuses.save()
+
+    return {
+        'homeworks': count,
+        'failed': len(failed),
+        'seconds': round(time.monotonic() - started, 3),
+    }
+
+
+def parse_args(argv=None):
+    """Параметры командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output', required=True,
+                        help='файл JSONL, "-" - стандартный вывод')
+    parser.add_argument('--from-date', type=int, default=0)
+    parser.add_argument('--tenants-file', default=TENANTS_FILE)
+    parser.add_argument('--endpoint', default=ENDPOINT)
+    parser.add_argument('--max-in-flight', type=int, default=MAX_IN_FLIGHT)
+    parser.add_argument('--seed-status-index',
+                        help='заполнить индекс статусов по выгрузке')
+    parser.add_argument('--log-level', default='WARNING')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Выгрузить историю пользователей из TENANTS_FILE."""
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level)
+
+    if args.tenants_file:
+        tenants = load_tenants(args.tenants_file)
+    elif PRACTICUM_TOKEN:
+        tenants = [Tenant(PRACTICUM_TOKEN, TELEGRAM_CHAT_ID)]
+    else:
+        logging.critical("Отсутствует обязательная переменная окружения!")
+        sys.exit()
+
+    statuses = None
+    if args.seed_status_index:
+        statuses = StatusIndex(path=args.seed_status_index)
+
+    if args.output == '-':
+        result = backfill(tenants, sys.stdout, args.from_date,
+                          args.endpoint, args.max_in_flight, statuses)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            result = backfill(tenants, file, args.from_date,
+                              args.endpoint, args.max_in_flight, statuses)
+    result['tenants'] = len(tenants)
+    print(json.dumps(result), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""
+Нагрузочный тест опроса на локальных заглушках API Практикума и телеграмма.
+
+Заглушки работают в отдельном процессе и не делят с опросом GIL,
+max_rss_kb - память только процесса опроса.
+
+Пример:
+    python benchmarks/bench.py --tenants 1000 --cycles 5 --output bench.jsonl
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'tests')]
+
+import poller  # noqa: E402
+from fake_servers import FakePracticum, FakeTelegram  # noqa: E402
+from rate_limiter import SendScheduler  # noqa: E402
+from retry import RetryPolicy  # noqa: E402
+
+
+def parse_args(argv=None):
+    """Параметры командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tenants', type=int, default=100)
+    parser.add_argument('--cycles', type=int, default=3)
+    parser.add_argument('--homeworks', type=int, default=1,
+                        help='работ в каждом ответе API')
+    parser.add_argument('--payload', type=int, default=100,
+                        help='длина комментария ревьюера в байтах')
+    parser.add_argument('--max-in-flight', type=int, default=50)
+    parser.add_argument('--api-latency', type=float, default=0.01)
+    parser.add_argument('--api-error-rate', type=float, default=0)
+    parser.add_argument('--telegram-latency', type=float, default=0.005)
+    parser.add_argument('--telegram-429-rate', type=float, default=0)
+    parser.add_argument('--send-rate', type=float, default=1e9,
+                        help='лимит отправки в секунду, общий и на чат')
+    parser.add_argument('--output', help='дописать результат в JSONL файл')
+    parser.add_argument('--log-level', default='CRITICAL')
+    return parser.parse_args(argv)
+
+
+def make_homeworks(count, payload):
+    """Работы для ответа API с комментарием длиной payload."""
+    return [
+        {
+            'id': number,
+            'homework_name': f'homework_{number}',
+            'status': 'approved',
+            'reviewer_comment': 'x' * payload,
+            'lesson_name': 'Итоговый проект',
+        }
+        for number in range(count)
+    ]
+
+
+def percentile(values, quantile):
+    """Квантиль значений, None - значений нет."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * quantile), len(ordered) - 1)]
+
+
+def git_revision():
+    """Текущий коммит, чтобы сравнивать результаты между версиями."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def timed_polls(engine, durations):
+    """Записывать длительность каждого опроса в durations."""
+    poll = engine.poll_tenant_safely
+
+    async def timed_poll(tenant):
+        started = time.perf_counter()
+        try:
+            await poll(tenant)
+        finally:
+            durations.append(time.perf_counter() - started)
+
+    engine.poll_tenant_safely = timed_poll
+
+
+async def run_cycles(engine, cycles):
+    """Выполнить cycles циклов опроса всех пользователей."""
+    for _ in range(cycles):
+        await engine.run_once()
+
+
+def serve(args, tokens, connection):
+    """
+    Процесс заглушек: отдает их адреса,.
+    по команде останавливается и отдает число отправленных сообщений.
+    """
+    homeworks = make_homeworks(args.homeworks, args.payload)
+    with FakePracticum(dict.fromkeys(tokens, homeworks),
+                       latency=args.api_latency,
+                       error_rate=args.api_error_rate,
+                       record=False) as practicum, \
+            FakeTelegram(latency=args.telegram_latency,
+                         flood_rate=args.telegram_429_rate,
+                         record=False) as telegram_api:
+        connection.send((
+            practicum.endpoint, telegram_api.token, telegram_api.base_url
+        ))
+        connection.recv()
+        connection.send(telegram_api.sent)
+
+
+@contextlib.contextmanager
+def fake_servers(args, tokens):
+    """
+    Заглушки в отдельном процессе,.
+    в конце в словаре появляется число отправленных сообщений.
+    """
+    context = multiprocessing.get_context('spawn')
+    connection, child = context.Pipe()
+    process = context.Process(target=serve, args=(args, tokens, child))
+    process.start()
+    endpoint, token, base_url = connection.recv()
+    servers = {'endpoint': endpoint, 'token': token, 'base_url': base_url}
+    try:
+        yield servers
+    finally:
+        connection.send('stop')
+        servers['sent'] = connection.recv()
+        process.join()
+
+
+def run(args):
+    """Прогнать опрос на заглушках и собрать результат."""
+    tokens = [f'token-{number}' for number in range(args.tenants)]
+    durations = []
+
+    with fake_servers(args, tokens) as servers:
+        tenants = [
+            poller.Tenant(token, str(number))
+            for number, token in enumerate(tokens, start=1)
+        ]
+        bot = poller.create_bot(
+            servers['token'], args.max_in_flight, servers['base_url']
+        )
+        engine = poller.Poller(
+            tenants, bot, endpoint=servers['endpoint'],
+            max_in_flight=args.max_in_flight
+        )
+        engine.retry_policy = RetryPolicy(base_delay=0.01, max_delay=0.1)
+        engine.sender = SendScheduler(
+            engine._deliver, global_rate=args.send_rate,
+            global_burst=args.send_rate, chat_rate=args.send_rate,
+            group_rate=args.send_rate
+        )
+        timed_polls(engine, durations)
+
+        started = time.perf_counter()
+        try:
+            asyncio.run(run_cycles(engine, args.cycles))
+        finally:
+            engine.close()
+        elapsed = time.perf_counter() - started
+    sent = servers['sent']
+
+    return {
+        'revision': git_revision(),
+        'time': int(time.time()),
+        'config': vars(args),
+        'elapsed': round(elapsed, 4),
+        'cycles_per_second': round(args.cycles / elapsed, 4),
+        'polls_per_second': round(len(durations) / elapsed, 2),
+        'messages_per_second': round(sent / elapsed, 2),
+        'messages_sent': sent,
+        'poll_latency_p50': percentile(durations, 0.5),
+        'poll_latency_p99': percentile(durations, 0.99),
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main(argv=None):
+    """Запустить тест и вывести результат одной строкой JSON."""
+    args = parse_args(argv)
+    output = args.output
+    logging.basicConfig(level=args.log_level)
+    result = run(args)
+    line = json.dumps(result, ensure_ascii=False)
+    print(line)
+    if output:
+        with open(output, 'a', encoding='utf-8') as file:
+            file.write(line + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+
+from checkpoint import atomic_write_json, read_json
+from constants import CARD_INDEX_SIZE, CARD_MAX_AGE
+
+
+class CardIndex:
+    """
+    Карточки статусов: для каждой работы в чате.
+    номер сообщения, которое редактируется при смене статуса.
+    Старые записи вытесняются по LRU.
+    """
+
+    def __init__(self, max_size=CARD_INDEX_SIZE, max_age=CARD_MAX_AGE,
+                 path=None):
+        """Не больше max_size карточек, карточка живет max_age секунд."""
+        self.max_size = max_size
+        self.max_age = max_age
+        self.path = path
+        self._cards = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path:
+            for key, message_id, sent_at in read_json(path, []):
+                self._cards[key] = (message_id, sent_at)
+
+    def __len__(self):
+        """Количество карточек."""
+        return len(self._cards)
+
+    @staticmethod
+    def _key(chat_id, homework_key):
+        return f'{chat_id}:{homework_key}'
+
+    def get(self, chat_id, homework_key):
+        """
+        Номер сообщения-карточки или None,.
+        если карточки нет или она старше max_age.
+        """
+        with self._lock:
+            card = self._cards.get(self._key(chat_id, homework_key))
+        if card is None or time.time() - card[1] > self.max_age:
+            return None
+        return card[0]
+
+    def set(self, chat_id, homework_key, message_id):
+        """Запомнить новое сообщение-карточку работы."""
+        key = self._key(chat_id, homework_key)
+        with self._lock:
+            self._cards[key] = (message_id, int(time.time()))
+            self._cards.move_to_end(key)
+            while len(self._cards) > self.max_size:
+                self._cards.popitem(last=False)
+
+    def discard(self, chat_id, homework_key):
+        """Забыть карточку, например удаленную пользователем."""
+        with self._lock:
+            self._cards.pop(self._key(chat_id, homework_key), None)
+
+    def save(self):
+        """Сохранить карточки на диск, если задан путь."""
+        if not self.path:
+            return
+        with self._lock:
+            items = [
+                [key, message_id, sent_at]
+                for key, (message_id, sent_at) in self._cards.items()
+            ]
+        atomic_write_json(self.path, items)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from constants import CHECKPOINT_FLUSH_INTERVAL
+
+
+def tenant_key(practicum_token):
+    """Ключ пользователя в хранилище, без хранения самого токена."""
+    return hashlib.sha256(str(practicum_token).encode()).hexdigest()[:16]
+
+
+def atomic_write_json(path, data):
+    """Записать JSON файл атомарно: через временный файл и os.replace."""
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(data, file, separators=(',', ':'))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    if hasattr(os, 'O_DIRECTORY'):
+        directory_descriptor = os.open(directory, os.O_DIRECTORY)
+        try:
+            os.fsync(directory_descriptor)
+        finally:
+            os.close(directory_descriptor)
+
+
+def read_json(path, default):
+    """Прочитать JSON файл, если его нет или он поврежден - default."""
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return default
+    except ValueError:
+        logging.error(f'Поврежден файл {path}, он будет перезаписан!')
+        return default
+
+
+def read_checkpoints(path):
+    """
+    Курсоры и активность пользователей из файла,.
+    в файле старого формата есть только курсоры.
+    """
+    data = read_json(path, {})
+    if 'cursors' in data:
+        return data['cursors'], data.get('activity', {})
+    return data, {}
+
+
+class CheckpointStore:
+    """
+    Курсоры current_date пользователей и их активность:.
+    время последней смены статуса и работы на проверке.
+    Изменения копятся в памяти и пишутся на диск одним файлом
+    не чаще раза в flush_interval секунд.
+    """
+
+    def __init__(self, path, flush_interval=CHECKPOINT_FLUSH_INTERVAL):
+        """Курсоры читаются из path, если файл есть."""
+        self.path = path
+        self.flush_interval = flush_interval
+        self._cursors, self._activity = read_checkpoints(path)
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.writes = 0
+
+    def get(self, key, default=None):
+        """Последний сохраненный курсор пользователя."""
+        return self._cursors.get(key, default)
+
+    def set(self, key, value):
+        """Запомнить курсор, запись на диск произойдет при flush."""
+        with self._lock:
+            if self._cursors.get(key) != value:
+                self._cursors[key] = value
+                self._dirty = True
+
+    def get_activity(self, key):
+        """
+        Пара (время последней смены статуса, ключи работ на проверке),.
+        None - активность не сохранялась.
+        """
+        activity = self._activity.get(key)
+        return tuple(activity) if activity else None
+
+    def set_activity(self, key, last_activity, reviewing):
+        """Запомнить активность пользователя до следующего flush."""
+        value = [int(last_activity), sorted(reviewing, key=str)]
+        with self._lock:
+            if self._activity.get(key) != value:
+                self._activity[key] = value
+                self._dirty = True
+
+    def merge(self, paths):
+        """
+        Дополнить курсоры и активность из других файлов,.
+        для каждого пользователя остаются самые поздние.
+        """
+        for path in paths:
+            if os.path.abspath(path) == os.path.abspath(self.path):
+                continue
+            cursors, activity = read_checkpoints(path)
+            for key, value in cursors.items():
+                if value and value > (self._cursors.get(key) or 0):
+                    self.set(key, value)
+            for key, value in activity.items():
+                known = self._activity.get(key)
+                if known is None or value[0] > known[0]:
+                    self.set_activity(key, *value)
+
+    def flush(self, force=False):
+        """
+        Записать накопленные курсоры, если прошло flush_interval,.
+        запись на диск идет с копией, не задерживая set.
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return False
+                elapsed = time.monotonic() - self._last_flush
+                if not force and elapsed < self.flush_interval:
+                    return False
+                data = {
+                    'cursors': dict(self._cursors),
+                    'activity': dict(self._activity),
+                }
+                self._dirty = False
+                self._last_flush = time.monotonic()
+
+            try:
+                atomic_write_json(self.path, data)
+            except BaseException:
+                with self._lock:
+                    self._dirty = True
+                raise
+            self.writes += 1
+        return True
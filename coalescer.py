@@ -0,0 +1,92 @@
+import asyncio
+
+from constants import COALESCE_WINDOW, TELEGRAM_MESSAGE_LIMIT
+
+SEPARATOR = '\n\n'
+
+
+def pack_messages(items, limit=TELEGRAM_MESSAGE_LIMIT):
+    """
+    Склеить пары (id, текст) в наименьшее число частей не длиннее limit,.
+    id сообщения попадает в ту часть, которой оно заканчивается.
+    """
+    parts = []
+    current = None
+
+    for item_id, message in items:
+        while len(message) > limit:
+            current = None
+            parts.append([[], message[:limit]])
+            message = message[limit:]
+
+        if not message and parts:
+            parts[-1][0].append(item_id)
+            continue
+
+        if current is not None and (
+            len(current[1]) + len(SEPARATOR) + len(message) <= limit
+        ):
+            current[1] = f'{current[1]}{SEPARATOR}{message}'
+        else:
+            current = [[], message]
+            parts.append(current)
+        current[0].append(item_id)
+
+    return [(ids, text) for ids, text in parts]
+
+
+def join_messages(messages, limit=TELEGRAM_MESSAGE_LIMIT):
+    """Склеить сообщения в наименьшее число частей не длиннее limit."""
+    return [text for _, text in pack_messages(enumerate(messages), limit)]
+
+
+class Coalescer:
+    """
+    Объединение сообщений в один чат,.
+    накопленных за window секунд, в одно сообщение телеграмма.
+    """
+
+    def __init__(self, send, window=COALESCE_WINDOW,
+                 limit=TELEGRAM_MESSAGE_LIMIT):
+        """Сообщения копятся window секунд и склеиваются до limit."""
+        self.send = send
+        self.window = window
+        self.limit = limit
+        self._pending = {}
+        self._tasks = set()
+        self.received = 0
+        self.sent = 0
+
+    @property
+    def queued(self):
+        """Сообщения, ожидающие объединения и отправки."""
+        return sum(len(messages) for messages, _ in self._pending.values())
+
+    def add(self, chat_id, message):
+        """Добавить сообщение, future завершится после его отправки."""
+        batch = self._pending.get(chat_id)
+
+        if batch is None:
+            loop = asyncio.get_running_loop()
+            batch = self._pending[chat_id] = ([], loop.create_future())
+            loop.call_later(self.window, self._schedule_flush, chat_id)
+
+        batch[0].append(message)
+        self.received += 1
+        return batch[1]
+
+    def _schedule_flush(self, chat_id):
+        task = asyncio.ensure_future(self._flush(chat_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, chat_id):
+        messages, future = self._pending.pop(chat_id)
+        try:
+            for part in join_messages(messages, self.limit):
+                await self.send(chat_id, part)
+                self.sent += 1
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            future.set_result(len(messages))
@@ -0,0 +1,126 @@
+import logging
+import time
+
+from constants import (COMMANDS_WEBHOOK_PORT, COMMANDS_WEBHOOK_URL,
+                       REFRESH_MIN_AGE)
+from exceptions import exception_fatal_error
+from homework import parse_status
+
+REFRESH_ARGS = ('refresh', 'обновить')
+
+
+def format_age(seconds):
+    """Возраст данных для человека."""
+    if seconds < 60:
+        return f'{int(seconds)} с.'
+    if seconds < 60 * 60:
+        return f'{int(seconds // 60)} мин.'
+    return f'{int(seconds // (60 * 60))} ч.'
+
+
+class Commands:
+    """
+    Ответы на команды /status и /history из кеша статусов,.
+    без запросов к API Практикума.
+    """
+
+    def __init__(self, poller, cache, refresh_min_age=REFRESH_MIN_AGE):
+        """Данные - из cache, обновления - через poller."""
+        self.poller = poller
+        self.cache = cache
+        self.refresh_min_age = refresh_min_age
+
+    def _statuses(self, tenant):
+        lines = []
+        for homework in self.cache.homeworks(tenant.key):
+            try:
+                lines.append(parse_status(homework))
+            except Exception as error:
+                logging.warning(f'Статус не показан: {error}')
+        return lines or ['Статусов работ пока нет.']
+
+    def _refresh(self, tenant, age):
+        """Опрос раньше расписания, если данные не совсем свежие."""
+        if age is not None and age < self.refresh_min_age:
+            return 'Данные свежие, обновление не требуется.'
+        if self.poller.request_refresh(tenant):
+            return 'Обновление запрошено, изменения придут сообщением.'
+        return 'Обновление сейчас недоступно.'
+
+    def status(self, chat_id, refresh=False, now=None):
+        """Последние статусы работ и возраст данных."""
+        tenants = self.poller.tenants_for_chat(chat_id)
+        if not tenants:
+            return 'Чат не подписан на статусы работ.'
+
+        lines = []
+        for tenant in tenants:
+            age = self.cache.age(tenant.key, now)
+            lines.extend(self._statuses(tenant))
+            if age is None:
+                lines.append('Данные еще не получены.')
+            else:
+                lines.append(f'Данные получены {format_age(age)} назад.')
+            if refresh:
+                lines.append(self._refresh(tenant, age))
+        return '\n'.join(lines)
+
+    def history(self, chat_id):
+        """Смены статусов работ, недавние в конце."""
+        tenants = self.poller.tenants_for_chat(chat_id)
+        if not tenants:
+            return 'Чат не подписан на статусы работ.'
+
+        lines = []
+        for tenant in tenants:
+            for changed_at, homework in self.cache.history(tenant.key):
+                moment = time.localtime(changed_at)
+                lines.append(
+                    f'{time.strftime("%d.%m %H:%M", moment)} '
+                    f'{homework.homework_name}: {homework.status}'
+                )
+        return '\n'.join(lines) or 'История статусов пока пуста.'
+
+    def on_status(self, update, context):
+        """Обработчик /status, с аргументом refresh - с обновлением."""
+        refresh = any(arg.lower() in REFRESH_ARGS for arg in context.args)
+        update.effective_message.reply_text(
+            self.status(update.effective_chat.id, refresh)
+        )
+
+    def on_history(self, update, context):
+        """Обработчик /history."""
+        update.effective_message.reply_text(
+            self.history(update.effective_chat.id)
+        )
+
+
+def start_commands(token, commands, webhook_port=COMMANDS_WEBHOOK_PORT,
+                   webhook_url=COMMANDS_WEBHOOK_URL, base_url=None):
+    """
+    Принимать команды бота в фоне: через локальный вебхук,.
+    если задан порт, иначе опросом getUpdates.
+    Для вебхука нужен внешний адрес webhook_url: по нему
+    телеграмм присылает команды.
+    """
+    from telegram.ext import CommandHandler, Updater
+
+    if webhook_port and not webhook_url:
+        raise exception_fatal_error(
+            'Для COMMANDS_WEBHOOK_PORT нужен COMMANDS_WEBHOOK_URL!'
+        )
+
+    updater = Updater(token=token, base_url=base_url)
+    dispatcher = updater.dispatcher
+    dispatcher.add_handler(CommandHandler('status', commands.on_status))
+    dispatcher.add_handler(CommandHandler('history', commands.on_history))
+
+    if webhook_port:
+        updater.start_webhook(
+            listen='127.0.0.1', port=webhook_port, url_path='commands',
+            webhook_url=webhook_url
+        )
+    else:
+        updater.start_polling()
+    logging.info('Команды бота принимаются')
+    return updater
@@ -9,9 +9,98 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_TIME = 600
+POLL_INTERVAL_MIN = int(os.getenv('POLL_INTERVAL_MIN', 60))
+POLL_INTERVAL_MAX = int(os.getenv('POLL_INTERVAL_MAX', 60 * 60))
+POLL_IDLE_AFTER = int(os.getenv('POLL_IDLE_AFTER', 60 * 60 * 24))
+POLL_JITTER = float(os.getenv('POLL_JITTER', 0.1))
+POLL_SPREAD = float(os.getenv('POLL_SPREAD', 0))
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
+TENANTS_FILE = os.getenv('TENANTS_FILE')
+MAX_IN_FLIGHT = int(os.getenv('MAX_IN_FLIGHT', 50))
+API_RATE = float(os.getenv('API_RATE', 0))
+API_BURST = int(os.getenv('API_BURST', 10))
+API_BACKOFF = float(os.getenv('API_BACKOFF', 5))
+API_MAX_BACKOFF = float(os.getenv('API_MAX_BACKOFF', 300))
+WORKERS = int(os.getenv('WORKERS', 1))
+WORKER_VNODES = int(os.getenv('WORKER_VNODES', 100))
+WORKER_RESTART_DELAY = float(os.getenv('WORKER_RESTART_DELAY', 1))
+WORKER_MAX_RESTART_DELAY = float(os.getenv('WORKER_MAX_RESTART_DELAY', 60))
+LEASE_FILE = os.getenv('LEASE_FILE')
+LEASE_SHARDS = int(os.getenv('LEASE_SHARDS', 64))
+LEASE_TTL = float(os.getenv('LEASE_TTL', 30))
+LEASE_HEARTBEAT = float(os.getenv('LEASE_HEARTBEAT', 10))
+
+API_CONNECT_TIMEOUT = float(os.getenv('API_CONNECT_TIMEOUT', 3.05))
+API_READ_TIMEOUT = float(os.getenv('API_READ_TIMEOUT', 10))
+STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', '0') == '1'
+STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', 16384))
+CYCLE_DEADLINE = float(os.getenv('CYCLE_DEADLINE', 60))
+HEDGE_REQUESTS = os.getenv('HEDGE_REQUESTS', '0') == '1'
+HEDGE_QUANTILE = float(os.getenv('HEDGE_QUANTILE', 0.95))
+HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', 20))
+
+RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', 3))
+RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', 1))
+RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', 30))
+BREAKER_FAILURES = int(os.getenv('BREAKER_FAILURES', 5))
+BREAKER_RESET_TIMEOUT = int(os.getenv('BREAKER_RESET_TIMEOUT', 60))
+
+ERROR_DIGEST_WINDOW = int(os.getenv('ERROR_DIGEST_WINDOW', 60 * 60))
+
+CHECKPOINT_FILE = os.getenv('CHECKPOINT_FILE', 'checkpoints.json')
+CHECKPOINT_FLUSH_INTERVAL = int(os.getenv('CHECKPOINT_FLUSH_INTERVAL', 5))
+
+STATUS_INDEX_FILE = os.getenv('STATUS_INDEX_FILE')
+STATUS_INDEX_SIZE = int(os.getenv('STATUS_INDEX_SIZE', 1_000_000))
+STATUS_INDEX_TTL = int(os.getenv('STATUS_INDEX_TTL', 60 * 60 * 24 * 90))
+BOT_COMMANDS = os.getenv('BOT_COMMANDS', '0') == '1'
+COMMANDS_WEBHOOK_PORT = int(os.getenv('COMMANDS_WEBHOOK_PORT', 0))
+COMMANDS_WEBHOOK_URL = os.getenv('COMMANDS_WEBHOOK_URL')
+REFRESH_MIN_AGE = int(os.getenv('REFRESH_MIN_AGE', 60))
+STATUS_HISTORY_SIZE = int(os.getenv('STATUS_HISTORY_SIZE', 20))
+STATUS_CARDS = os.getenv('STATUS_CARDS', '0') == '1'
+CARD_INDEX_FILE = os.getenv('CARD_INDEX_FILE')
+CARD_INDEX_SIZE = int(os.getenv('CARD_INDEX_SIZE', 100000))
+CARD_MAX_AGE = int(os.getenv('CARD_MAX_AGE', 24 * 60 * 60))
+STATUS_OVERLAP = int(os.getenv('STATUS_OVERLAP', 60))
+
+TELEGRAM_GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 30))
+TELEGRAM_GLOBAL_BURST = int(os.getenv('TELEGRAM_GLOBAL_BURST', 30))
+TELEGRAM_CHAT_RATE = float(os.getenv('TELEGRAM_CHAT_RATE', 1))
+TELEGRAM_GROUP_RATE = float(os.getenv('TELEGRAM_GROUP_RATE', 20 / 60))
+TELEGRAM_SEND_RETRIES = int(os.getenv('TELEGRAM_SEND_RETRIES', 5))
+TELEGRAM_FLOOD_CHATS = int(os.getenv('TELEGRAM_FLOOD_CHATS', 2))
+TELEGRAM_MESSAGE_LIMIT = 4096
+COALESCE_WINDOW = float(os.getenv('COALESCE_WINDOW', 0))
+
+OUTBOX_FILE = os.getenv('OUTBOX_FILE')
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 500))
+OUTBOX_COMMIT_WINDOW = float(os.getenv('OUTBOX_COMMIT_WINDOW', 0.005))
+OUTBOX_DRAIN_INTERVAL = float(os.getenv('OUTBOX_DRAIN_INTERVAL', 1))
+OUTBOX_MAX_DELAY = int(os.getenv('OUTBOX_MAX_DELAY', 300))
+
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+METRICS_SNAPSHOT_FILE = os.getenv('METRICS_SNAPSHOT_FILE')
+METRICS_SNAPSHOT_INTERVAL = int(os.getenv('METRICS_SNAPSHOT_INTERVAL', 60))
+
+TRAFFIC_FILE = os.getenv('TRAFFIC_FILE')
+
+LOG_FILE = os.getenv('LOG_FILE', 'homework.log')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN')
+LOG_JSON = os.getenv('LOG_JSON', '0') == '1'
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', 100))
+NO_NEW_STATUSES = 'Отсутствие в ответе новых статусов!'
+
+POOL_CONNECTIONS = int(os.getenv('POOL_CONNECTIONS', 10))
+POOL_MAXSIZE = int(os.getenv('POOL_MAXSIZE', MAX_IN_FLIGHT))
+POOL_BLOCK = os.getenv('POOL_BLOCK', '1') == '1'
+POOL_KEEP_ALIVE = os.getenv('POOL_KEEP_ALIVE', '1') == '1'
+
 
 VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -0,0 +1,78 @@
+import re
+import time
+
+from constants import ERROR_DIGEST_WINDOW
+
+VOLATILE_PARTS = re.compile(r'0x[0-9a-fA-F]+|\d{4,}')
+
+
+def fingerprint(error):
+    """Тип ошибки и текст без меняющихся чисел и адресов."""
+    message = VOLATILE_PARTS.sub('N', str(error))
+    return f'{type(error).__name__}: {message}'
+
+
+class ErrorAggregator:
+    """
+    Сводка повторяющихся ошибок:.
+    первая ошибка сообщается сразу, повторы - одной сводкой за окно.
+    """
+
+    def __init__(self, window=ERROR_DIGEST_WINDOW, clock=time.monotonic):
+        """Повторы ошибки сводятся в сводку раз в window секунд."""
+        self.window = window
+        self.clock = clock
+        self._errors = {}
+
+    def record(self, error):
+        """Учесть ошибку и вернуть сообщения, которые пора отправить."""
+        now = self.clock()
+        key = fingerprint(error)
+        state = self._errors.get(key)
+        messages = []
+
+        if state is None:
+            self._errors[key] = {'error': str(error), 'since': now, 'count': 0}
+            messages.append(f'Сбой в работе программы: {error}')
+        else:
+            state['count'] += 1
+
+        messages.extend(self.digests(now))
+        return messages
+
+    def digests(self, now=None):
+        """Сводки по ошибкам, у которых закончилось окно."""
+        now = now or self.clock()
+        messages = []
+
+        for state in self._errors.values():
+            if now - state['since'] < self.window:
+                continue
+            if state['count']:
+                messages.append(self._digest(state))
+            state['since'] = now
+            state['count'] = 0
+        return messages
+
+    def _digest(self, state):
+        minutes = max(int(self.window // 60), 1)
+        return (
+            f'Сбой в работе программы: {state["error"]} '
+            f'x{state["count"]} за последние {minutes} мин.'
+        )
+
+    def resolve(self):
+        """Работа восстановилась: вернуть итоговое сообщение или None."""
+        if not self._errors:
+            return None
+
+        summary = [
+            f'{state["error"]} x{state["count"]}'
+            for state in self._errors.values() if state['count']
+        ]
+        self._errors = {}
+
+        message = 'Работа программы восстановлена.'
+        if summary:
+            message += ' Повторы сбоев: ' + '; '.join(summary)
+        return message
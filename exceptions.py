@@ -20,3 +20,21 @@ class exception_type_error(TypeError):
             self.message = args[0]
         else:
             self.message = None
+
+
+class exception_retryable_error(exception_error):
+    pass
+
+
+class exception_fatal_error(exception_error):
+    pass
+
+
+class exception_circuit_open(exception_retryable_error):
+    pass
+
+
+class exception_rate_limited(exception_retryable_error):
+    def __init__(self, *args, retry_after=None):
+        super().__init__(*args)
+        self.retry_after = retry_after
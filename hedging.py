@@ -0,0 +1,58 @@
+import asyncio
+from collections import deque
+
+from constants import HEDGE_MIN_SAMPLES, HEDGE_QUANTILE
+
+
+class LatencyTracker:
+    """Скользящее окно последних задержек запросов."""
+
+    def __init__(self, size=500, quantile=HEDGE_QUANTILE,
+                 min_samples=HEDGE_MIN_SAMPLES):
+        """Окно из size задержек, порог - квантиль quantile."""
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self._window = deque(maxlen=size)
+
+    def add(self, seconds):
+        """Учесть задержку выполненного запроса."""
+        self._window.append(seconds)
+
+    def threshold(self):
+        """Квантиль задержки, None - пока мало данных."""
+        if len(self._window) < self.min_samples:
+            return None
+        ordered = sorted(self._window)
+        index = min(int(len(ordered) * self.quantile), len(ordered) - 1)
+        return ordered[index]
+
+
+async def hedged(make_call, delay, stats=None):
+    """
+    Выполнить запрос, а если он не ответил за delay секунд,.
+    запустить второй такой же и вернуть первый полученный ответ.
+    """
+    first = asyncio.ensure_future(make_call())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    second = asyncio.ensure_future(make_call())
+    if stats is not None:
+        stats['hedged'] += 1
+
+    pending = {first, second}
+    error = None
+    while pending:
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            if task.exception() is None:
+                for other in pending:
+                    other.cancel()
+                if stats is not None and task is second:
+                    stats['hedge_wins'] += 1
+                return task.result()
+            error = task.exception()
+    raise error
@@ -1,66 +1,249 @@
 import logging
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 
-import requests
-from telegram import Bot
-
-from constants import (ENDPOINT, HEADERS, PRACTICUM_TOKEN, RETRY_TIME,
-                       TELEGRAM_CHAT_ID, TELEGRAM_TOKEN, VERDICTS)
-from exceptions import (exception_error, exception_key_error,
-                        exception_type_error)
+from checkpoint import CheckpointStore, tenant_key
+from constants import (API_CONNECT_TIMEOUT, API_READ_TIMEOUT,
+                       CHECKPOINT_FILE, CYCLE_DEADLINE, ENDPOINT, HEADERS,
+                       METRICS_PORT, METRICS_SNAPSHOT_FILE,
+                       METRICS_SNAPSHOT_INTERVAL, NO_NEW_STATUSES,
+                       PRACTICUM_TOKEN, RETRY_TIME, STREAM_CHUNK_SIZE,
+                       STREAM_RESPONSES, TELEGRAM_CHAT_ID, TELEGRAM_TOKEN,
+                       TENANTS_FILE, TRAFFIC_FILE, WORKERS)
+from error_digest import ErrorAggregator
+from exceptions import (exception_error, exception_fatal_error,
+                        exception_key_error, exception_rate_limited,
+                        exception_retryable_error, exception_type_error)
+from homework_record import MESSAGE_PREFIX, STATUS_MESSAGES, HomeworkRecord
+from http_session import get_session
+from json_stream import HomeworkStream
+from logging_setup import setup_logging
+from metrics import (API_RESPONSES, MESSAGES, start_http_server,
+                     start_snapshot_writer, timed)
+from retry import CircuitBreaker, call_with_retry
+from traffic import capture, capturing, start_capture
+
+RETRYABLE_STATUSES = (
+    HTTPStatus.REQUEST_TIMEOUT,
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+
+
+_bot_names = {}
+
+
+def get_bot_name(bot):
+    """Имя бота запрашивается у телеграмма один раз."""
+    key = getattr(bot, 'token', id(bot))
+    name = _bot_names.get(key)
+    if name is None:
+        name = _bot_names[key] = bot['username']
+    return name
+
+
+def warm_up(bot, endpoint=ENDPOINT):
+    """
+    Параллельно установить соединения с API Практикума и телеграмма,.
+    чтобы первый цикл опроса не тратил время на DNS и TLS.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = (
+            executor.submit(
+                get_session().get, endpoint,
+                timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT)
+            ),
+            executor.submit(get_bot_name, bot),
+        )
+        for future in futures:
+            try:
+                future.result()
+            except Exception as error:
+                logging.warning(f'{error}. Не удалось прогреть соединение!')
 
 
 def send_message(bot, message):
     """Отправка в телеграмм бот сообщения."""
+    send_chat_message(bot, TELEGRAM_CHAT_ID, message)
+
+
+@timed('send_message')
+def send_chat_message(bot, chat_id, message):
+    """Отправка сообщения в указанный чат телеграмма."""
+    started = time.time()
     try:
-        name_bot = bot['username']
+        name_bot = get_bot_name(bot)
         logging.info(
             f'Отправка сообщения на телеграмм бот: {name_bot}!'
         )
-        bot.send_message(TELEGRAM_CHAT_ID, message)
+        sent = bot.send_message(chat_id, message)
     except Exception as error:
+        MESSAGES.inc(result='failed')
+        capture('tg', started, c=chat_id, m=message, e=str(error))
         if error == 'Unauthorized':
-            raise exception_error(f'{error}. Некорректный токен!')
+            raise exception_error(f'{error}. Некорректный токен!') from error
         else:
             raise exception_error(
                 f'{error}. Не удалось отправить сообщение в телеграмм бот!'
-            )
+            ) from error
     else:
+        MESSAGES.inc(result='sent')
+        capture('tg', started, c=chat_id, m=message)
         logging.info(
             f'Сообщение успешно отправленно на телеграмм бот: {name_bot}!'
         )
+        return sent
+
+
+@timed('edit_message')
+def edit_chat_message(bot, chat_id, message_id, message):
+    """
+    Заменить текст отправленного ранее сообщения,.
+    False - сообщение изменить нельзя и нужно отправить новое.
+    """
+    from telegram.error import BadRequest
+
+    started = time.time()
+    try:
+        bot.edit_message_text(message, chat_id=chat_id, message_id=message_id)
+    except BadRequest as error:
+        if 'not modified' in str(error):
+            capture('tg', started, c=chat_id, i=message_id, m=message)
+            return True
+        MESSAGES.inc(result='not_edited')
+        capture('tg', started, c=chat_id, i=message_id, m=message,
+                e=str(error))
+        logging.warning(f'{error}. Сообщение {message_id} не изменено!')
+        return False
+    except Exception as error:
+        MESSAGES.inc(result='failed')
+        capture('tg', started, c=chat_id, i=message_id, m=message,
+                e=str(error))
+        raise exception_error(
+            f'{error}. Не удалось изменить сообщение в телеграмм боте!'
+        ) from error
+
+    MESSAGES.inc(result='edited')
+    capture('tg', started, c=chat_id, i=message_id, m=message)
+    return True
 
 
 def check_get_api(endpoint, params):
-    """Проверка на положительный и отрицательные запросы к API."""
+    """
+    Проверка на положительный и отрицательные запросы к API,.
+    временные ошибки отделяются от постоянных.
+    """
+    started = time.time()
     try:
-        response = requests.get(endpoint, **params)
-        message_error = f'{response.status_code}.'
+        response = open_api(endpoint, params)
+        try:
+            answer = response.json()
+        except ValueError as error:
+            raise exception_retryable_error(
+                f'{error}. Некорректный ответ от {endpoint}!'
+            ) from error
+    except Exception as error:
+        if capturing():
+            capture_api(started, params, e=str(error))
+        raise
+
+    if capturing():
+        capture_api(started, params, b=answer)
+    return answer
+
+
+def capture_api(started, params, **fields):
+    """Записать запрос к API: пользователь - ключом, без токена."""
+    token = params['headers'].get('Authorization', '').rpartition(' ')[2]
+    capture(
+        'api', started, u=tenant_key(token),
+        f=params['params'].get('from_date'), **fields
+    )
+
+
+def open_api(endpoint, params):
+    """Запрос к API с проверкой кода ответа, тело ответа не читается."""
+    from requests import RequestException
+
+    try:
+        response = get_session().get(endpoint, **params)
+    except RequestException as error:
+        API_RESPONSES.inc(status='error')
+        raise exception_retryable_error(
+            f'{error}. Запрос на адрес {endpoint} не выполнен!'
+        ) from error
+
+    API_RESPONSES.inc(status=response.status_code)
+    message_error = (
+        f'{response.status_code}. '
         f'Запрос на адрес {endpoint} завершился с ошибкой!'
+    )
+
+    if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+        raise exception_rate_limited(
+            message_error, retry_after=get_retry_after_header(response)
+        )
+    if response.status_code != HTTPStatus.OK:
+        if response.status_code in RETRYABLE_STATUSES:
+            raise exception_retryable_error(message_error)
+        raise exception_fatal_error(message_error)
+
+    logging.info(f'Запрос на адрес {endpoint} прошел успешно!')
+    return response
+
 
-        if response.status_code == HTTPStatus.OK:
-            logging.info(f'Запрос на адрес {endpoint} прошел успешно!')
-            return response.json()
-        raise exception_error(message_error)
-    except Exception:
-        raise exception_error(message_error)
+def get_retry_after_header(response):
+    """Пауза в секундах из заголовка Retry-After, если он задан числом."""
+    try:
+        return float(response.headers['Retry-After'])
+    except (KeyError, TypeError, ValueError):
+        return None
 
 
 def get_api_answer(current_timestamp):
     """Проверка что запрос прошел успешно."""
+    return request_api_answer(ENDPOINT, HEADERS, current_timestamp)
+
+
+@timed('get_api_answer')
+def request_api_answer(endpoint, headers, current_timestamp):
+    """Запрос статусов работ с заданными адресом и заголовками."""
     timestamp = current_timestamp or int(time.time())
 
     params = dict(
-        headers=HEADERS,
-        params={'from_date': timestamp}
+        headers=headers,
+        params={'from_date': timestamp},
+        timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT)
     )
 
-    response = check_get_api(ENDPOINT, params)
+    response = check_get_api(endpoint, params)
     return response
 
 
+@timed('get_api_answer')
+def stream_api_answer(endpoint, headers, current_timestamp):
+    """
+    Запрос статусов работ без чтения тела ответа,.
+    работы разбираются по одной при обходе результата.
+    """
+    params = dict(
+        headers=headers,
+        params={'from_date': current_timestamp or int(time.time())},
+        timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT),
+        stream=True
+    )
+    response = open_api(endpoint, params)
+    return HomeworkStream(
+        response.iter_content(STREAM_CHUNK_SIZE), close=response.close
+    )
+
+
+@timed('check_response')
 def check_response(response):
     """
     Проверка что запрос соотвествует ожидаемому.
@@ -81,32 +264,31 @@ def check_response(response):
     if not isinstance(homeworks, list):
         raise exception_type_error('Ожидается под ключем homeworks список!')
 
-    return homeworks
+    return [HomeworkRecord.from_dict(homework) for homework in homeworks]
 
 
+@timed('parse_status')
 def parse_status(homework):
     """
     Из полученной работы получить статус,.
     из статуса сформировать и вернуть строку.
     """
-    status = homework.get('status')
+    homework = HomeworkRecord.from_dict(homework)
 
-    if not status:
+    if not homework.status:
         raise exception_error('Недокументированный статус домашней работы!')
 
-    if 'homework_name' not in homework:
+    if homework.homework_name is None:
         raise exception_key_error(
             'Некорректный запрашеваемый элемент по ключу homework_name!'
         )
 
-    homework_name = homework.get('homework_name')
+    verdict = STATUS_MESSAGES.get(homework.status)
 
-    if status not in VERDICTS:
+    if verdict is None:
         raise exception_key_error('Статусы работ не определены!')
 
-    verdict = VERDICTS.get(status)
-
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return f'{MESSAGE_PREFIX}{homework.homework_name}{verdict}'
 
 
 def check_tokens():
@@ -114,6 +296,27 @@ def check_tokens():
     return all((PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID))
 
 
+def fetch_api_answer(current_timestamp):
+    """Ответ API целиком или, при STREAM_RESPONSES, потоком."""
+    if STREAM_RESPONSES:
+        return stream_api_answer(ENDPOINT, HEADERS, current_timestamp)
+    return get_api_answer(current_timestamp)
+
+
+def send_statuses(bot, response):
+    """Отправить статусы работ из ответа, вернуть их количество."""
+    if isinstance(response, HomeworkStream):
+        homeworks = response
+    else:
+        homeworks = check_response(response)
+
+    count = 0
+    for homework in homeworks:
+        send_message(bot, parse_status(homework))
+        count += 1
+    return count
+
+
 def main():
     """
     Получить из API статус домашней работы,.
@@ -123,45 +326,68 @@ def main():
         logging.critical("Отсутствует обязательная переменная окружения!")
         sys.exit()
 
+    from telegram import Bot
+
     bot = Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = int(time.time())
+    warm_up(bot)
+    checkpoints = CheckpointStore(CHECKPOINT_FILE)
+    key = tenant_key(PRACTICUM_TOKEN)
+    current_timestamp = checkpoints.get(key) or int(time.time())
 
-    previous_message = ''
+    errors = ErrorAggregator()
+    deadline = time.monotonic()
+    breaker = CircuitBreaker()
 
     while True:
         try:
-            response = get_api_answer(current_timestamp)
-
-            homeworks = check_response(response)
+            response = call_with_retry(
+                fetch_api_answer, current_timestamp, breaker=breaker,
+                deadline=time.monotonic() + CYCLE_DEADLINE
+            )
 
-            if homeworks:
-                for homework in homeworks:
-                    message = parse_status(homework)
-                    send_message(bot, message)
-            else:
-                logging.debug('Отсутствие в ответе новых статусов!')
+            if not send_statuses(bot, response):
+                logging.debug(NO_NEW_STATUSES)
 
             current_timestamp = response.get('current_date', current_timestamp)
+            checkpoints.set(key, current_timestamp)
+            checkpoints.flush(force=True)
         except Exception as error:
-            message = f'Сбой в работе программы: {error}'
-            logging.exception(message)
+            logging.exception(f'Сбой в работе программы: {error}')
 
-            if not previous_message == message:
+            for message in errors.record(error):
                 send_message(bot, message)
-                previous_message = message
+        else:
+            notice = errors.resolve()
+            if notice:
+                send_message(bot, notice)
         finally:
-            time.sleep(RETRY_TIME)
+            deadline = max(deadline + RETRY_TIME, time.monotonic())
+            time.sleep(max(deadline - time.monotonic(), 0))
 
 
-if __name__ == '__main__':
-    logging.basicConfig(
-        level=logging.DEBUG,
-        filename='homework.log',
-        filemode='w',
-        format=(
-            '%(asctime)s, %(levelname)s, %(message)s,\
-            %(funcName)s, %(lineno)d, %(name)s'
-        )
-    )
+def start_services():
+    """
+    Метрики и запись обмена процесса опроса,.
+    у процессов-обработчиков они свои.
+    """
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT)
+    if METRICS_SNAPSHOT_FILE:
+        start_snapshot_writer(METRICS_SNAPSHOT_FILE, METRICS_SNAPSHOT_INTERVAL)
+    if TRAFFIC_FILE:
+        start_capture(TRAFFIC_FILE)
 
-    main()
+
+if __name__ == '__main__':
+    setup_logging()
+
+    if TENANTS_FILE and WORKERS > 1:
+        import supervisor
+        supervisor.main()
+    elif TENANTS_FILE:
+        import poller
+        start_services()
+        poller.main()
+    else:
+        start_services()
+        main()
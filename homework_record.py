@@ -0,0 +1,68 @@
+import sys
+
+from constants import VERDICTS
+
+MESSAGE_PREFIX = 'Изменился статус проверки работы "'
+
+STATUS_MESSAGES = {
+    sys.intern(status): f'". {verdict}' for status, verdict in VERDICTS.items()
+}
+
+
+def intern_status(status):
+    """Одна строка в памяти на каждый статус."""
+    return sys.intern(status) if type(status) is str else status
+
+
+class HomeworkRecord:
+    """
+    Работа из ответа API: только нужные поля, без словаря,.
+    статус хранится интернированной строкой.
+    """
+
+    __slots__ = ('id', 'homework_name', 'status', 'date_updated')
+
+    def __init__(self, id=None, homework_name=None, status=None,
+                 date_updated=None):
+        """Статус интернируется при создании записи."""
+        self.id = id
+        self.homework_name = homework_name
+        self.status = intern_status(status)
+        self.date_updated = date_updated
+
+    @classmethod
+    def from_dict(cls, data):
+        """Запись из элемента списка homeworks, лишние поля отбрасываются."""
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, dict):
+            return cls()
+        return cls(
+            data.get('id'), data.get('homework_name'),
+            data.get('status'), data.get('date_updated')
+        )
+
+    @property
+    def key(self):
+        """Идентификатор работы, при его отсутствии - название."""
+        return self.id or self.homework_name
+
+    def as_dict(self):
+        """Заполненные поля записи."""
+        return {
+            field: getattr(self, field) for field in self.__slots__
+            if getattr(self, field) is not None
+        }
+
+    def __eq__(self, other):
+        """Записи равны, если равны все поля."""
+        if not isinstance(other, HomeworkRecord):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field)
+            for field in self.__slots__
+        )
+
+    def __repr__(self):
+        """Заполненные поля для логов."""
+        return f'HomeworkRecord({self.as_dict()})'
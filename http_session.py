@@ -0,0 +1,79 @@
+import threading
+
+from constants import (POOL_BLOCK, POOL_CONNECTIONS, POOL_KEEP_ALIVE,
+                       POOL_MAXSIZE)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections=POOL_CONNECTIONS,
+                   pool_maxsize=POOL_MAXSIZE, pool_block=POOL_BLOCK,
+                   keep_alive=POOL_KEEP_ALIVE):
+    """
+    Сессия с пулом соединений,.
+    pool_maxsize ограничивает число соединений к одному хосту.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive' if keep_alive else 'close',
+    })
+    return session
+
+
+def get_session():
+    """Общая для всех запросов к API сессия, создается при первом вызове."""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def close_session():
+    """Закрыть общую сессию и все ее соединения."""
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def connection_stats(session=None):
+    """Счетчики открытых соединений и повторного их использования."""
+    session = session or _session
+    stats = {'connections': 0, 'requests': 0, 'reused': 0}
+
+    if session is None:
+        return stats
+
+    seen = set()
+    for adapter in session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats['connections'] += pool.num_connections
+            stats['requests'] += pool.num_requests
+
+    stats['reused'] = max(stats['requests'] - stats['connections'], 0)
+    return stats
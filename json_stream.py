@@ -0,0 +1,169 @@
+import codecs
+import json
+
+from exceptions import (exception_key_error, exception_retryable_error,
+                        exception_type_error)
+from homework_record import HomeworkRecord
+
+WHITESPACE = ' \t\n\r'
+
+_decoder = json.JSONDecoder()
+
+
+class HomeworkStream:
+    """
+    Ответ API, который разбирается по мере получения,.
+    работы из списка key отдаются по одной записью HomeworkRecord
+    и в памяти не копятся.
+    Остальные поля ответа доступны через get после разбора.
+    """
+
+    def __init__(self, chunks, key='homeworks', close=None):
+        """Части ответа - из chunks, close освобождает соединение."""
+        self.key = key
+        self.fields = {}
+        self.count = 0
+        self.reads = 0
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder('utf-8')().decode
+        self._buffer = ''
+        self._position = 0
+        self._close = close
+
+    def get(self, key, default=None):
+        """Поле ответа кроме списка работ."""
+        return self.fields.get(key, default)
+
+    def close(self):
+        """Освободить соединение, даже если ответ не дочитан."""
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def on_close(self, callback):
+        """Вызвать callback при закрытии ответа после close соединения."""
+        close = self._close
+
+        def chained():
+            try:
+                if close is not None:
+                    close()
+            finally:
+                callback()
+
+        self._close = chained
+
+    def _read(self):
+        """Дочитать следующую часть ответа, False - ответ закончился."""
+        for chunk in self._chunks:
+            text = self._decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buffer = self._buffer[self._position:] + text
+                self._position = 0
+                self.reads += 1
+                return True
+        return False
+
+    def _skip(self):
+        """Пропустить пробелы и вернуть следующий символ, '' - конец."""
+        while True:
+            buffer = self._buffer
+            while (self._position < len(buffer)
+                   and buffer[self._position] in WHITESPACE):
+                self._position += 1
+            if self._position < len(buffer):
+                return buffer[self._position]
+            if not self._read():
+                return ''
+
+    def _expect(self, chars):
+        char = self._skip()
+        if not char or char not in chars:
+            raise exception_retryable_error(
+                f'Некорректный ответ: ожидается один из символов {chars}!'
+            )
+        self._position += 1
+        return char
+
+    def _value(self):
+        """Следующее значение JSON целиком."""
+        self._skip()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as error:
+                if self._read():
+                    continue
+                raise exception_retryable_error(
+                    f'{error}. Некорректный ответ!'
+                ) from error
+            if end == len(self._buffer) and self._read():
+                continue
+            self._position = end
+            return value
+
+    def _items(self):
+        if self._skip() != '[':
+            raise exception_type_error(
+                'Ожидается под ключем homeworks список!'
+            )
+        self._position += 1
+        if self._skip() == ']':
+            self._position += 1
+            return
+
+        while True:
+            self.count += 1
+            yield HomeworkRecord.from_dict(self._value())
+            if self._expect(',]') == ']':
+                return
+
+    def __iter__(self):
+        """Работы по одной в порядке следования в ответе."""
+        try:
+            yield from self._parse()
+        finally:
+            self.close()
+
+    def _parse(self):
+        if self._skip() != '{':
+            raise exception_type_error(
+                'Ожидается в присланном ответе коллекцию!'
+            )
+        self._position += 1
+        found = False
+
+        if self._skip() == '}':
+            self._position += 1
+        else:
+            while True:
+                key = self._value()
+                self._expect(':')
+                if key == self.key:
+                    found = True
+                    yield from self._items()
+                else:
+                    self.fields[key] = self._value()
+                if self._expect(',}') == '}':
+                    break
+
+        if not found:
+            raise exception_key_error(
+                'Некорректный запрашиваемый элемент по ключу!'
+            )
+
+    def batches(self):
+        """
+        Работы списками: в список попадает то,.
+        что уже получено, до ожидания следующей части ответа.
+        """
+        batch = []
+        reads = self.reads
+        for homework in self:
+            if self.reads != reads and batch:
+                yield batch
+                batch = []
+            reads = self.reads
+            batch.append(homework)
+        if batch:
+            yield batch
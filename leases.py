@@ -0,0 +1,163 @@
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from constants import LEASE_SHARDS, LEASE_TTL
+
+
+def default_owner():
+    """Имя узла: хост и номер процесса."""
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+class LeaseStore:
+    """
+    Аренда долей пользователей узлами в общей базе SQLite,.
+    каждую долю в любой момент опрашивает не больше одного узла.
+    Узел продлевает свои аренды и забирает истекшие, доли делятся
+    между живыми узлами поровну.
+    База ведется с журналом отката, а не WAL: WAL требует общей памяти
+    и работает только на одном хосте. Для нескольких машин файл должен
+    лежать на файловой системе с рабочими блокировками POSIX.
+    """
+
+    def __init__(self, path, owner=None, shards=LEASE_SHARDS, ttl=LEASE_TTL):
+        """База path, узел owner, shards долей, аренда на ttl секунд."""
+        self.path = path
+        self.owner = owner or default_owner()
+        self.shards = shards
+        self.ttl = ttl
+        self.owned = frozenset()
+        self.valid_until = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=ttl, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute('PRAGMA journal_mode=DELETE')
+        self._connection.executescript(
+            'CREATE TABLE IF NOT EXISTS leases ('
+            'shard INTEGER PRIMARY KEY, '
+            'owner TEXT NOT NULL, '
+            'expires_at REAL NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS nodes ('
+            'owner TEXT PRIMARY KEY, '
+            'expires_at REAL NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS cursors ('
+            'tenant TEXT PRIMARY KEY, '
+            'cursor INTEGER NOT NULL);'
+        )
+
+    def shard_of(self, key):
+        """Доля, к которой относится пользователь с ключом key."""
+        return int(key, 16) % self.shards
+
+    def owns(self, key):
+        """Опрашивает ли этот узел пользователя прямо сейчас."""
+        return (
+            self.shard_of(key) in self.owned
+            and time.monotonic() < self.valid_until
+        )
+
+    def sync(self, cursors=None, keep=()):
+        """
+        Сохранить курсоры, продлить аренды и перераспределить доли,.
+        доли из keep не отдаются, даже если их больше положенного.
+        """
+        valid_until = time.monotonic() + self.ttl
+        now = time.time()
+        expires_at = now + self.ttl
+
+        with self._lock:
+            db = self._connection
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                self._save_cursors(cursors or {})
+                db.execute(
+                    'INSERT OR REPLACE INTO nodes VALUES (?, ?)',
+                    (self.owner, expires_at)
+                )
+                db.execute(
+                    'UPDATE leases SET expires_at = ? WHERE owner = ?',
+                    (expires_at, self.owner)
+                )
+                owned = self._rebalance(now, expires_at, set(keep))
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+        self.owned = frozenset(owned)
+        self.valid_until = valid_until
+        return self.owned
+
+    def _save_cursors(self, cursors):
+        self._connection.executemany(
+            'INSERT INTO cursors VALUES (?, ?) ON CONFLICT(tenant) '
+            'DO UPDATE SET cursor = MAX(cursor, excluded.cursor)',
+            [(key, value) for key, value in cursors.items() if value]
+        )
+
+    def _rebalance(self, now, expires_at, keep):
+        db = self._connection
+        nodes = db.execute(
+            'SELECT COUNT(*) FROM nodes WHERE expires_at > ?', (now,)
+        ).fetchone()[0]
+        share = math.ceil(self.shards / max(nodes, 1))
+        owned = [shard for shard, in db.execute(
+            'SELECT shard FROM leases WHERE owner = ? ORDER BY shard',
+            (self.owner,)
+        )]
+
+        extra = [shard for shard in owned if shard not in keep]
+        extra = extra[:max(len(owned) - share, 0)]
+        db.executemany(
+            'DELETE FROM leases WHERE shard = ?', [(shard,) for shard in extra]
+        )
+        owned = [shard for shard in owned if shard not in extra]
+
+        taken = {shard for shard, in db.execute(
+            'SELECT shard FROM leases WHERE expires_at > ?', (now,)
+        )}
+        free = [shard for shard in range(self.shards) if shard not in taken]
+        claimed = free[:max(share - len(owned), 0)]
+        db.executemany(
+            'INSERT OR REPLACE INTO leases VALUES (?, ?, ?)',
+            [(shard, self.owner, expires_at) for shard in claimed]
+        )
+        return owned + claimed
+
+    def cursors(self, keys, chunk=500):
+        """Сохраненные курсоры пользователей с ключами keys."""
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), chunk):
+                part = keys[start:start + chunk]
+                found.update(self._connection.execute(
+                    'SELECT tenant, cursor FROM cursors '
+                    f'WHERE tenant IN ({",".join("?" * len(part))})', part
+                ))
+        return found
+
+    def release(self, cursors=None):
+        """Сохранить курсоры и отдать все доли другим узлам."""
+        with self._lock:
+            db = self._connection
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                self._save_cursors(cursors or {})
+                db.execute('DELETE FROM leases WHERE owner = ?', (self.owner,))
+                db.execute('DELETE FROM nodes WHERE owner = ?', (self.owner,))
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+        self.owned = frozenset()
+
+    def close(self):
+        """Закрыть соединение с базой."""
+        with self._lock:
+            self._connection.close()
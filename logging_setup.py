@@ -0,0 +1,102 @@
+import atexit
+import json
+import logging
+import queue
+from logging.handlers import (QueueHandler, QueueListener,
+                              RotatingFileHandler, TimedRotatingFileHandler)
+
+from constants import (LOG_BACKUP_COUNT, LOG_FILE, LOG_JSON, LOG_LEVEL,
+                       LOG_MAX_BYTES, LOG_ROTATE_WHEN, LOG_SAMPLE_EVERY,
+                       NO_NEW_STATUSES)
+
+LOG_FORMAT = (
+    '%(asctime)s, %(levelname)s, %(message)s, '
+    '%(funcName)s, %(lineno)d, %(name)s'
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись лога одной строкой JSON."""
+
+    def format(self, record):
+        """Сформировать строку JSON из записи."""
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'func': record.funcName,
+            'line': record.lineno,
+            'logger': record.name,
+        }
+        tenant = getattr(record, 'tenant', None)
+        if tenant is not None:
+            data['tenant'] = tenant
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class SampleFilter(logging.Filter):
+    """
+    Пропускать только каждую every-ю запись о пустом ответе API,.
+    отдельно для каждого пользователя.
+    """
+
+    def __init__(self, every=LOG_SAMPLE_EVERY, message=NO_NEW_STATUSES):
+        """Пропускать только каждую every-ю запись message."""
+        super().__init__()
+        self.every = every
+        self.message = message
+        self._counts = {}
+
+    def filter(self, record):
+        """Решить, попадет ли запись в лог."""
+        if self.every <= 1 or record.msg != self.message:
+            return True
+        tenant = getattr(record, 'tenant', None)
+        count = self._counts.get(tenant, 0)
+        self._counts[tenant] = count + 1
+        return count % self.every == 0
+
+
+def create_file_handler(path, max_bytes=LOG_MAX_BYTES,
+                        backup_count=LOG_BACKUP_COUNT, when=LOG_ROTATE_WHEN):
+    """Файл лога с ротацией по времени when или по размеру max_bytes."""
+    if when:
+        return TimedRotatingFileHandler(
+            path, when=when, backupCount=backup_count, encoding='utf-8'
+        )
+    return RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+
+
+def setup_logging(path=LOG_FILE, level=LOG_LEVEL, json_lines=LOG_JSON,
+                  sample_every=LOG_SAMPLE_EVERY, handler=None):
+    """
+    Логирование через очередь: запись на диск выполняет.
+    отдельный поток, а не код опроса.
+    """
+    handler = handler or create_file_handler(path)
+    handler.setFormatter(
+        JsonFormatter() if json_lines else logging.Formatter(LOG_FORMAT)
+    )
+
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    queue_handler.addFilter(SampleFilter(sample_every))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    listener = QueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_listener, listener)
+    return listener
+
+
+def stop_listener(listener):
+    """Дописать оставшиеся в очереди записи и остановить поток."""
+    if listener._thread is not None:
+        listener.stop()
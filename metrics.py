@@ -0,0 +1,253 @@
+import bisect
+import functools
+import logging
+import threading
+import time
+
+from checkpoint import atomic_write_json
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30,
+)
+
+
+def _labels_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key):
+    if not key:
+        return ''
+    pairs = ','.join(f'{name}="{value}"' for name, value in key)
+    return f'{{{pairs}}}'
+
+
+class Metric:
+    """Базовая метрика со значениями по наборам меток."""
+
+    kind = 'untyped'
+
+    def __init__(self, name, description):
+        """Метрика name с описанием для /metrics."""
+        self.name = name
+        self.description = description
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def samples(self):
+        """Пары (имя с метками, значение) для вывода."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f'{self.name}{_format_labels(key)}', value
+
+
+class Counter(Metric):
+    """Монотонно растущий счетчик."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Увеличить счетчик."""
+        key = _labels_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Текущее значение, в том числе вычисляемое при чтении."""
+
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        """Установить значение."""
+        with self._lock:
+            self._values[_labels_key(labels)] = value
+
+    def set_function(self, func, **labels):
+        """Значение будет вычисляться вызовом func при каждом чтении."""
+        self.set(func, **labels)
+
+    def samples(self):
+        """Пары (имя с метками, значение) для вывода."""
+        for name, value in super().samples():
+            yield name, value() if callable(value) else value
+
+
+class Histogram(Metric):
+    """Распределение значений по корзинам."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, description, buckets=LATENCY_BUCKETS):
+        """Гистограмма с верхними границами корзин buckets."""
+        super().__init__(name, description)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """Учесть значение."""
+        key = _labels_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0]
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        """Накопленные значения корзин, сумма и количество."""
+        with self._lock:
+            items = [
+                (key, list(counts), total, count)
+                for key, (counts, total, count) in self._values.items()
+            ]
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(key + (('le', str(bound)),))
+                yield f'{self.name}_bucket{labels}', cumulative
+            labels = _format_labels(key + (('le', '+Inf'),))
+            yield f'{self.name}_bucket{labels}', count
+            yield f'{self.name}_sum{_format_labels(key)}', total
+            yield f'{self.name}_count{_format_labels(key)}', count
+
+
+class Registry:
+    """Набор метрик приложения."""
+
+    def __init__(self):
+        """Пустой реестр метрик."""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, description, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(
+                    name, description, **kwargs
+                )
+        return metric
+
+    def counter(self, name, description):
+        """Счетчик с именем name, создается при первом обращении."""
+        return self._get(Counter, name, description)
+
+    def gauge(self, name, description):
+        """Текущее значение с именем name."""
+        return self._get(Gauge, name, description)
+
+    def histogram(self, name, description, buckets=LATENCY_BUCKETS):
+        """Гистограмма с именем name."""
+        return self._get(Histogram, name, description, buckets=buckets)
+
+    def render(self):
+        """Все метрики в текстовом формате Prometheus."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, value in metric.samples():
+                lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """Все метрики в виде словаря для JSON."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            'time': int(time.time()),
+            'metrics': {
+                name: value
+                for metric in metrics for name, value in metric.samples()
+            },
+        }
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'homework_stage_seconds', 'Длительность этапов опроса и отправки.'
+)
+API_RESPONSES = REGISTRY.counter(
+    'homework_api_responses_total', 'Ответы API Практикума по кодам.'
+)
+MESSAGES = REGISTRY.counter(
+    'homework_messages_total', 'Отправленные и неотправленные сообщения.'
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    'homework_queue_depth', 'Глубина очередей сообщений.'
+)
+API_UTILIZATION = REGISTRY.gauge(
+    'homework_api_utilization',
+    'Доля бюджета запросов к API Практикума: частота и одновременность.'
+)
+CYCLE_OVERRUNS = REGISTRY.gauge(
+    'homework_cycle_overruns', 'Опросы, не уложившиеся в интервал.'
+)
+
+
+def timed(stage):
+    """Декоратор: время выполнения функции попадает в STAGE_SECONDS."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(
+                    time.perf_counter() - started, stage=stage
+                )
+        return wrapper
+    return decorator
+
+
+def start_http_server(port, host='127.0.0.1', registry=REGISTRY):
+    """Отдавать метрики по адресу http://host:port/metrics в фоне."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header(
+                'Content-Type', 'text/plain; version=0.0.4; charset=utf-8'
+            )
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f'Метрики доступны на порту {server.server_address[1]}')
+    return server
+
+
+def start_snapshot_writer(path, interval, registry=REGISTRY):
+    """Раз в interval секунд сохранять метрики в JSON файл."""
+    stopped = threading.Event()
+
+    def write_forever():
+        while not stopped.wait(interval):
+            try:
+                atomic_write_json(path, registry.snapshot())
+            except OSError:
+                logging.exception('Не удалось сохранить метрики!')
+
+    threading.Thread(target=write_forever, daemon=True).start()
+    return stopped
@@ -0,0 +1,130 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+from constants import (OUTBOX_BATCH_SIZE, OUTBOX_COMMIT_WINDOW,
+                       OUTBOX_MAX_DELAY)
+
+
+class Outbox:
+    """
+    Очередь исходящих сообщений в SQLite в режиме WAL.
+    Сообщение удаляется из очереди только после подтверждения
+    отправки от телеграмма.
+    """
+
+    def __init__(self, path, batch_size=OUTBOX_BATCH_SIZE,
+                 max_delay=OUTBOX_MAX_DELAY):
+        """Очередь в базе path, пауза перед повтором - до max_delay секунд."""
+        self.path = path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS outbox ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'chat_id TEXT NOT NULL, '
+            'text TEXT NOT NULL, '
+            'created_at REAL NOT NULL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, '
+            'next_attempt_at REAL NOT NULL DEFAULT 0)'
+        )
+        self._connection.commit()
+        self.commits = 0
+
+    def __len__(self):
+        """Количество неотправленных сообщений."""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM outbox'
+            ).fetchone()[0]
+
+    def enqueue_many(self, messages):
+        """Добавить пары (chat_id, текст) одной транзакцией."""
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT INTO outbox (chat_id, text, created_at) '
+                'VALUES (?, ?, ?)',
+                [(str(chat_id), text, now) for chat_id, text in messages]
+            )
+            self.commits += 1
+
+    def enqueue(self, chat_id, text):
+        """Добавить одно сообщение."""
+        self.enqueue_many([(chat_id, text)])
+
+    def pending(self, limit=None):
+        """Сообщения, которые пора отправить, в порядке добавления."""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT id, chat_id, text FROM outbox '
+                'WHERE next_attempt_at <= ? ORDER BY id LIMIT ?',
+                (time.time(), limit or self.batch_size)
+            ).fetchall()
+
+    def ack(self, ids):
+        """Удалить отправленные сообщения."""
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'DELETE FROM outbox WHERE id = ?', [(id_,) for id_ in ids]
+            )
+
+    def retry_later(self, ids):
+        """Отложить сообщения с экспоненциально растущей задержкой."""
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'UPDATE outbox SET attempts = attempts + 1, '
+                'next_attempt_at = ? + MIN(?, 1 << attempts) WHERE id = ?',
+                [(now, self.max_delay, id_) for id_ in ids]
+            )
+
+    def close(self):
+        """Закрыть соединение с базой."""
+        with self._lock:
+            self._connection.close()
+
+
+class GroupCommit:
+    """
+    Запись в очередь сообщений, добавленных за window секунд,.
+    одной транзакцией.
+    """
+
+    def __init__(self, outbox, run_blocking, window=OUTBOX_COMMIT_WINDOW):
+        """Записи копятся window секунд, запись - через run_blocking."""
+        self.outbox = outbox
+        self.run_blocking = run_blocking
+        self.window = window
+        self._pending = None
+        self._tasks = set()
+
+    def add(self, chat_id, text):
+        """Добавить сообщение, future завершится после записи на диск."""
+        if self._pending is None:
+            loop = asyncio.get_running_loop()
+            self._pending = ([], loop.create_future())
+            loop.call_later(self.window, self._schedule_commit)
+
+        self._pending[0].append((chat_id, text))
+        return self._pending[1]
+
+    def _schedule_commit(self):
+        task = asyncio.ensure_future(self._commit())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _commit(self):
+        messages, future = self._pending
+        self._pending = None
+        try:
+            await self.run_blocking(self.outbox.enqueue_many, messages)
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            future.set_result(len(messages))
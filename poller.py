@@ -0,0 +1,736 @@
+import asyncio
+import glob
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cards import CardIndex
+from checkpoint import CheckpointStore, tenant_key
+from coalescer import Coalescer, pack_messages
+from commands import Commands, start_commands
+from constants import (API_RATE, BOT_COMMANDS, CARD_INDEX_FILE,
+                       CHECKPOINT_FILE, CYCLE_DEADLINE, ENDPOINT,
+                       HEDGE_REQUESTS, LEASE_FILE, LEASE_HEARTBEAT,
+                       MAX_IN_FLIGHT, NO_NEW_STATUSES, OUTBOX_DRAIN_INTERVAL,
+                       OUTBOX_FILE, RETRY_TIME, STATUS_CARDS,
+                       STATUS_INDEX_FILE, STATUS_OVERLAP, STREAM_RESPONSES,
+                       TELEGRAM_TOKEN, TENANTS_FILE)
+from error_digest import ErrorAggregator
+from exceptions import exception_rate_limited, exception_retryable_error
+from hedging import LatencyTracker, hedged
+from homework import (check_response, edit_chat_message, parse_status,
+                      request_api_answer, send_chat_message,
+                      stream_api_answer, warm_up)
+from http_session import close_session, connection_stats
+from json_stream import HomeworkStream
+from leases import LeaseStore
+from metrics import API_UTILIZATION, CYCLE_OVERRUNS, QUEUE_DEPTH
+from outbox import GroupCommit, Outbox
+from rate_limiter import ApiGovernor, SendScheduler
+from retry import CircuitBreaker, RetryPolicy, acall_with_retry
+from scheduler import PollSchedule
+from status_cache import StatusCache
+from status_index import StatusIndex, homework_key
+
+
+class Tenant:
+    """
+    Пользователь бота: токен Практикума и чат телеграмма,.
+    статусы также получают чаты подписчиков.
+    """
+
+    def __init__(self, practicum_token, chat_id, subscribers=()):
+        """Первый опрос - с текущего момента."""
+        self.practicum_token = practicum_token
+        self.chat_id = chat_id
+        self.chat_ids = [chat_id]
+        for subscriber in subscribers:
+            self.subscribe(subscriber)
+        self.key = tenant_key(practicum_token)
+        self.headers = {'Authorization': f'OAuth {practicum_token}'}
+        self.current_timestamp = int(time.time())
+        self.errors = ErrorAggregator()
+        self.last_activity = time.time()
+        self.reviewing = set()
+        self.wakeup = None
+        self.resumed = False
+
+    def subscribe(self, chat_id):
+        """Добавить чат подписчика, например ментора."""
+        if str(chat_id) not in map(str, self.chat_ids):
+            self.chat_ids.append(chat_id)
+
+
+def load_tenants(path):
+    """
+    Прочитать список пользователей из JSON файла,.
+    записи с одним токеном объединяются в одного пользователя.
+    """
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+
+    tenants = {}
+    for item in data:
+        token = item['practicum_token']
+        tenant = tenants.get(token)
+        if tenant is None:
+            tenant = tenants[token] = Tenant(token, item['chat_id'])
+        else:
+            tenant.subscribe(item['chat_id'])
+        for subscriber in item.get('subscribers', ()):
+            tenant.subscribe(subscriber)
+    return list(tenants.values())
+
+
+class Poller:
+    """
+    Опрос API Практикума для множества пользователей,.
+    с ограничением количества одновременных запросов.
+    """
+
+    def __init__(self, tenants, bot, endpoint=ENDPOINT,
+                 max_in_flight=MAX_IN_FLIGHT, retry_time=RETRY_TIME,
+                 checkpoints=None, statuses=None, overlap=0,
+                 cycle_deadline=CYCLE_DEADLINE, hedge=HEDGE_REQUESTS,
+                 outbox=None, leases=None, stream=STREAM_RESPONSES,
+                 cards=None, cache=None, governor=None):
+        """Необязательные хранилища подключаются, если переданы."""
+        self.tenants = tenants
+        self.governor = governor or ApiGovernor(max_in_flight=max_in_flight)
+        self.cards = cards
+        self.cache = cache
+        self._by_chat = {}
+        for tenant in tenants:
+            for chat_id in tenant.chat_ids:
+                self._by_chat.setdefault(str(chat_id), []).append(tenant)
+        self.stream = stream
+        self.leases = leases
+        self.outbox = outbox
+        self.checkpoints = checkpoints
+        self.statuses = statuses
+        self.overlap = overlap if statuses is not None else 0
+        self.bot = bot
+        self.endpoint = endpoint
+        self.max_in_flight = max_in_flight
+        self.schedule = PollSchedule(base=retry_time)
+        self.retry_policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.cycle_deadline = cycle_deadline
+        self.hedge = hedge
+        self.latencies = LatencyTracker()
+        self.hedge_stats = {'hedged': 0, 'hedge_wins': 0}
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self._coordinated = None
+        self._busy = set()
+        self._loop = None
+        self.sender = SendScheduler(self._deliver)
+        self.coalescer = Coalescer(self._send)
+        self.outbox_writer = (
+            GroupCommit(outbox, self._call) if outbox is not None else None
+        )
+
+        self._register_metrics()
+
+        if checkpoints is not None:
+            for tenant in tenants:
+                tenant.current_timestamp = checkpoints.get(
+                    tenant.key, tenant.current_timestamp
+                )
+                activity = checkpoints.get_activity(tenant.key)
+                if activity is not None:
+                    tenant.last_activity, reviewing = activity
+                    tenant.reviewing = set(reviewing)
+
+    def _register_metrics(self):
+        QUEUE_DEPTH.set_function(lambda: self.sender.queued, queue='telegram')
+        QUEUE_DEPTH.set_function(
+            lambda: self.coalescer.queued, queue='coalescer'
+        )
+        if self.outbox is not None:
+            QUEUE_DEPTH.set_function(lambda: len(self.outbox), queue='outbox')
+        CYCLE_OVERRUNS.set_function(lambda: self.schedule.overruns)
+        for kind in ('rate', 'concurrency'):
+            API_UTILIZATION.set_function(
+                lambda kind=kind: self.governor.utilization()[kind], kind=kind
+            )
+
+    async def _call(self, func, *args):
+        """Выполнить блокирующую функцию в пуле потоков."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _deliver(self, chat_id, message):
+        return await self._call(
+            send_chat_message, self.bot, chat_id, message
+        )
+
+    async def _edit(self, chat_id, card):
+        message_id, message = card
+        return await self._call(
+            edit_chat_message, self.bot, chat_id, message_id, message
+        )
+
+    async def update_card(self, chat_id, homework, message):
+        """
+        Изменить карточку статуса работы в чате,.
+        новое сообщение отправляется, только если изменить нельзя.
+        """
+        message_id = self.cards.get(chat_id, homework.key)
+        if message_id is not None:
+            edited = await self.sender.send(
+                chat_id, (message_id, message), deliver=self._edit
+            )
+            if edited:
+                return
+            self.cards.discard(chat_id, homework.key)
+
+        sent = await self.sender.send(chat_id, message)
+        if sent is not None:
+            self.cards.set(chat_id, homework.key, sent.message_id)
+
+    async def _send(self, chat_id, message):
+        await self.sender.send(chat_id, message)
+
+    def _release_slot(self, loop, future, abandoned):
+        """
+        Вернуть место в бюджете по завершении запроса,.
+        потоковый ответ держит место до close, который может
+        вызываться и из потока пула.
+        """
+        if future.cancelled() or future.exception() is not None:
+            self.governor.release()
+            return
+        response = future.result()
+        if not isinstance(response, HomeworkStream):
+            self.governor.release()
+            return
+        response.on_close(
+            lambda: loop.call_soon_threadsafe(self.governor.release)
+        )
+        if abandoned:
+            response.close()
+
+    async def _request_once(self, tenant, from_date):
+        """
+        Запрос в потоке пула: при отмене ожидания место в бюджете,.
+        освобождается только после завершения самого запроса,
+        а для потокового ответа - после его закрытия.
+        """
+        request = stream_api_answer if self.stream else request_api_answer
+        loop = asyncio.get_running_loop()
+        await self.governor.acquire()
+        started = time.monotonic()
+        try:
+            future = loop.run_in_executor(
+                self._executor, request, self.endpoint, tenant.headers,
+                from_date
+            )
+        except BaseException:
+            self.governor.release()
+            raise
+        abandoned = []
+        future.add_done_callback(
+            lambda done: self._release_slot(loop, done, abandoned)
+        )
+        try:
+            response = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            abandoned.append(True)
+            raise
+        except exception_rate_limited as error:
+            self.governor.throttle(error.retry_after)
+            raise
+        self.governor.on_success()
+        self.latencies.add(time.monotonic() - started)
+        return response
+
+    async def _request(self, tenant, from_date):
+        """
+        Запрос к API, при hedge - с дублирующим запросом после p95,.
+        потоковые ответы не дублируются.
+        """
+        hedge = self.hedge and not self.stream
+        threshold = self.latencies.threshold() if hedge else None
+        if threshold is None:
+            return await self._request_once(tenant, from_date)
+
+        return await hedged(
+            lambda: self._request_once(tenant, from_date),
+            threshold, self.hedge_stats
+        )
+
+    async def _seed_cache(self, tenant):
+        """
+        Первый опрос после запуска: все работы пользователя.
+        попадают в кеш команд, статусы не отправляются.
+        После постоянной ошибки, например неверного токена,
+        запрос не повторяется.
+        """
+        try:
+            response = await self._fetch(tenant, 1)
+            if isinstance(response, HomeworkStream):
+                homeworks = await self._call(list, response)
+            else:
+                homeworks = check_response(response)
+        except exception_retryable_error as error:
+            logging.warning(
+                f'Кеш статусов не заполнен, повтор при следующем опросе: '
+                f'{error}', extra={'tenant': tenant.key}
+            )
+            return
+        except Exception as error:
+            logging.warning(
+                f'Кеш статусов заполняется только новыми статусами: {error}',
+                extra={'tenant': tenant.key}
+            )
+            homeworks = []
+        self.cache.seed(tenant.key, homeworks)
+
+    async def _fetch(self, tenant, from_date):
+        """
+        Запрос к API с повторами, ограниченный по времени cycle_deadline,.
+        отправка статусов в это время не входит.
+        """
+        try:
+            return await asyncio.wait_for(
+                acall_with_retry(
+                    self._request, tenant, from_date,
+                    policy=self.retry_policy, breaker=self.breaker,
+                    deadline=time.monotonic() + self.cycle_deadline
+                ),
+                self.cycle_deadline
+            )
+        except asyncio.TimeoutError as error:
+            raise exception_retryable_error(
+                f'Опрос не уложился в {self.cycle_deadline} с.!'
+            ) from error
+
+    async def poll_tenant(self, tenant):
+        """Один цикл опроса API и отправки статусов пользователю."""
+        if self.cache is not None and not self.cache.seeded(tenant.key):
+            await self._seed_cache(tenant)
+
+        from_date = tenant.current_timestamp
+        if from_date and not tenant.resumed:
+            from_date = max(from_date - self.overlap, 1)
+
+        response = await self._fetch(tenant, from_date)
+        if isinstance(response, HomeworkStream):
+            count = await self._process_stream(tenant, response)
+        else:
+            homeworks = check_response(response)
+            await self._process(tenant, homeworks)
+            count = len(homeworks)
+
+        if not count:
+            logging.debug(NO_NEW_STATUSES, extra={'tenant': tenant.key})
+        if self.cache is not None:
+            self.cache.touch(tenant.key)
+
+        tenant.current_timestamp = response.get(
+            'current_date', tenant.current_timestamp
+        )
+        tenant.resumed = False
+        if self.checkpoints is not None:
+            self.checkpoints.set(tenant.key, tenant.current_timestamp)
+            self.checkpoints.set_activity(
+                tenant.key, tenant.last_activity, tenant.reviewing
+            )
+
+    async def _process(self, tenant, homeworks):
+        self.schedule.observe(tenant, homeworks)
+        if self.cache is not None:
+            self.cache.update(tenant.key, homeworks)
+        if homeworks:
+            await self._send_statuses(tenant, homeworks)
+
+    async def _process_stream(self, tenant, stream):
+        """
+        Отправлять статусы по мере разбора ответа,.
+        не дожидаясь его окончания.
+        """
+        batches = stream.batches()
+        count = 0
+        try:
+            while True:
+                homeworks = await self._call(next, batches, None)
+                if homeworks is None:
+                    return count
+                count += len(homeworks)
+                await self._process(tenant, homeworks)
+        finally:
+            stream.close()
+
+    def _deliver_status(self, chat_id, homework, message):
+        """Карточка статуса или обычное сообщение в чат."""
+        if self.cards is not None:
+            return self.update_card(chat_id, homework, message)
+        return self._dispatch(chat_id, message)
+
+    def _dispatch(self, chat_id, message):
+        """Сообщение уходит в очередь на диске или сразу на отправку."""
+        if self.outbox_writer is not None:
+            return self.outbox_writer.add(chat_id, message)
+        return self.coalescer.add(chat_id, message)
+
+    async def drain_outbox(self):
+        """
+        Отправить пачку сообщений из очереди,.
+        вернуть количество подтвержденных телеграммом.
+        """
+        rows = await self._call(self.outbox.pending)
+        by_chat = {}
+        for message_id, chat_id, text in rows:
+            by_chat.setdefault(chat_id, []).append((message_id, text))
+
+        sent = await asyncio.gather(*(
+            self._deliver_outbox_chat(chat_id, messages)
+            for chat_id, messages in by_chat.items()
+        ))
+        return sum(sent)
+
+    async def _deliver_outbox_chat(self, chat_id, messages):
+        sent = 0
+        parts = pack_messages(messages, self.coalescer.limit)
+
+        for number, (ids, text) in enumerate(parts):
+            try:
+                await self._send(chat_id, text)
+            except Exception:
+                logging.exception(
+                    f'Сообщения для чата {chat_id} остаются в очереди!'
+                )
+                rest = [id_ for part_ids, _ in parts[number:]
+                        for id_ in part_ids]
+                await self._call(self.outbox.retry_later, rest)
+                break
+            await self._call(self.outbox.ack, ids)
+            sent += len(ids)
+        return sent
+
+    async def _drain_outbox_forever(self):
+        while True:
+            if not await self.drain_outbox():
+                await asyncio.sleep(OUTBOX_DRAIN_INTERVAL)
+
+    async def _send_statuses(self, tenant, homeworks):
+        """
+        Отправить изменившиеся статусы работ во все чаты пользователя,.
+        сообщение формируется один раз и объединяется с другими в чате.
+        """
+        messages = [
+            (homework, parse_status(homework)) for homework in homeworks
+        ]
+
+        if self.statuses is not None:
+            messages = [
+                (homework, message) for homework, message in messages
+                if self.statuses.is_changed(
+                    homework_key(tenant.key, homework), homework.status
+                )
+            ]
+
+        await asyncio.gather(*(
+            asyncio.shield(self._deliver_homework(tenant, homework, message))
+            for homework, message in messages
+        ))
+
+    async def _deliver_homework(self, tenant, homework, message):
+        """
+        Статус работы во все чаты пользователя: сбой одного чата.
+        не мешает остальным. Статус запоминается, если доставлен хотя бы
+        в один чат, иначе пробрасывается ошибка и он будет отправлен снова.
+        Статус запоминается сразу после доставки, даже если опрос отменен.
+        """
+        results = await asyncio.gather(*(
+            self._deliver_status(chat_id, homework, message)
+            for chat_id in tenant.chat_ids
+        ), return_exceptions=True)
+
+        errors = []
+        for chat_id, result in zip(tenant.chat_ids, results):
+            if isinstance(result, Exception):
+                logging.error(
+                    f'Статус не доставлен в чат {chat_id}: {result}',
+                    extra={'tenant': tenant.key}
+                )
+                errors.append(result)
+        if errors and len(errors) == len(results):
+            raise errors[0]
+
+        if self.statuses is not None:
+            self.statuses.remember(
+                homework_key(tenant.key, homework), homework.status
+            )
+
+    async def poll_tenant_safely(self, tenant):
+        """Цикл опроса пользователя с отправкой ему сообщения о сбое."""
+        try:
+            await self.poll_tenant(tenant)
+        except Exception as error:
+            logging.exception(f'Сбой в работе программы: {error}')
+            messages = tenant.errors.record(error)
+        else:
+            notice = tenant.errors.resolve()
+            messages = [notice] if notice else []
+
+        for message in messages:
+            try:
+                await self._send(tenant.chat_id, message)
+            except Exception:
+                logging.exception('Не удалось отправить сообщение о сбое!')
+
+    def flush_checkpoints(self, force=False):
+        """Сохранить курсоры пользователей и индекс статусов на диск."""
+        if self.checkpoints is not None and self.checkpoints.flush(force):
+            if self.statuses is not None:
+                self.statuses.save()
+            if self.cards is not None:
+                self.cards.save()
+
+    async def _flush_checkpoints_forever(self):
+        while True:
+            await asyncio.sleep(self.checkpoints.flush_interval)
+            await self._call(self.flush_checkpoints)
+
+    def _owned_cursors(self, shards):
+        return {
+            tenant.key: tenant.current_timestamp for tenant in self.tenants
+            if self.leases.shard_of(tenant.key) in shards
+        }
+
+    def coordinate(self, busy=()):
+        """
+        Продлить аренды долей пользователей,.
+        для новых долей продолжить с курсоров прежнего владельца,
+        а без них - с локального курсора.
+        С курсора прежнего владельца опрос идет без перекрытия:
+        статусы до него уже отправлены, а индекс статусов у узлов свой.
+        """
+        before = self.leases.owned
+        owned = self.leases.sync(
+            self._owned_cursors(before),
+            keep={self.leases.shard_of(key) for key in busy}
+        )
+        acquired = [
+            tenant for tenant in self.tenants
+            if self.leases.shard_of(tenant.key) in owned - before
+        ]
+        stored = self.leases.cursors(tenant.key for tenant in acquired)
+        for tenant in acquired:
+            if tenant.key in stored:
+                tenant.current_timestamp = stored[tenant.key]
+                tenant.resumed = True
+        return owned
+
+    async def _coordinate(self):
+        """Новые опросы ждут, пока идет перераспределение долей."""
+        self._coordinated.clear()
+        try:
+            await self._call(self.coordinate, set(self._busy))
+        finally:
+            self._coordinated.set()
+
+    async def _coordinate_forever(self):
+        while True:
+            await asyncio.sleep(LEASE_HEARTBEAT)
+            try:
+                await self._coordinate()
+            except Exception:
+                logging.exception('Не удалось продлить аренду пользователей!')
+
+    def owns(self, tenant):
+        """Опрашивает ли этот узел пользователя."""
+        return self.leases is None or self.leases.owns(tenant.key)
+
+    async def poll_owned_tenant(self, tenant):
+        """Цикл опроса, если доля пользователя принадлежит этому узлу."""
+        if self.leases is not None:
+            await self._coordinated.wait()
+        if not self.owns(tenant):
+            return
+
+        self._busy.add(tenant.key)
+        try:
+            await self.poll_tenant_safely(tenant)
+        finally:
+            self._busy.discard(tenant.key)
+
+    def _ensure_loop(self):
+        """Примитивы asyncio привязаны к циклу событий, в котором созданы."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._coordinated = asyncio.Event()
+            self._coordinated.set()
+            self.sender.reset_locks()
+
+    async def run_once(self):
+        """Опросить всех пользователей один раз."""
+        self._ensure_loop()
+        if self.leases is not None:
+            await self._coordinate()
+        await asyncio.gather(
+            *(self.poll_owned_tenant(tenant) for tenant in self.tenants)
+        )
+        await self._call(self.flush_checkpoints, True)
+
+        if self.outbox is not None:
+            while await self.drain_outbox():
+                pass
+
+    def tenants_for_chat(self, chat_id):
+        """Пользователи, статусы которых получает чат."""
+        return self._by_chat.get(str(chat_id), [])
+
+    def request_refresh(self, tenant):
+        """
+        Опросить пользователя раньше расписания, можно вызывать.
+        из других потоков. Запросы до начала опроса и во время него
+        объединяются с этим опросом.
+        """
+        if self._loop is None or self._loop.is_closed():
+            return False
+        self._loop.call_soon_threadsafe(self._wake, tenant)
+        return True
+
+    def _wake(self, tenant):
+        if tenant.wakeup is not None and tenant.key not in self._busy:
+            tenant.wakeup.set()
+
+    async def _run_tenant(self, tenant):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.schedule.initial_delay(tenant)
+        tenant.wakeup = asyncio.Event()
+
+        while True:
+            try:
+                await asyncio.wait_for(
+                    tenant.wakeup.wait(), max(deadline - loop.time(), 0)
+                )
+            except asyncio.TimeoutError:
+                pass
+            else:
+                deadline = loop.time()
+            tenant.wakeup.clear()
+            await self.poll_owned_tenant(tenant)
+            deadline = self.schedule.next_deadline(
+                tenant, deadline, loop.time()
+            )
+
+    async def run_forever(self):
+        """Бесконечно опрашивать всех пользователей."""
+        self._ensure_loop()
+        if self.leases is not None:
+            await self._coordinate()
+        tasks = [self._run_tenant(tenant) for tenant in self.tenants]
+        if self.checkpoints is not None:
+            tasks.append(self._flush_checkpoints_forever())
+        if self.outbox is not None:
+            tasks.append(self._drain_outbox_forever())
+        if self.leases is not None:
+            tasks.append(self._coordinate_forever())
+        await asyncio.gather(*tasks)
+
+    def close(self):
+        """Остановить пул потоков, сохранить курсоры и отдать аренды."""
+        self._executor.shutdown(wait=True)
+        self.flush_checkpoints(force=True)
+        if self.outbox is not None:
+            self.outbox.close()
+        if self.leases is not None:
+            self.leases.release(self._owned_cursors(self.leases.owned))
+            self.leases.close()
+
+
+def create_bot(token, max_in_flight=MAX_IN_FLIGHT, base_url=None):
+    """Бот с пулом соединений под параллельную отправку."""
+    from telegram import Bot
+    from telegram.utils.request import Request
+
+    return Bot(
+        token=token,
+        base_url=base_url,
+        request=Request(con_pool_size=max_in_flight)
+    )
+
+
+def shard_path(path, suffix):
+    """Путь к файлу состояния отдельного процесса-обработчика."""
+    return f'{path}{suffix}' if path else path
+
+
+def commands_enabled(suffix=''):
+    """
+    Принимать ли команды бота: только одним процессом.
+    без аренды, иначе у процесса кеш лишь части пользователей,
+    а одновременные getUpdates нескольких узлов конфликтуют.
+    """
+    if not BOT_COMMANDS or suffix:
+        return False
+    if LEASE_FILE:
+        logging.warning(
+            'Команды бота не принимаются при LEASE_FILE: '
+            'у каждого узла только свои пользователи!'
+        )
+        return False
+    return True
+
+
+def run(tenants, suffix='', share=1):
+    """
+    Опрашивать API для списка пользователей,.
+    файлы состояния берутся с суффиксом suffix.
+    Процессу достается 1/share общего бюджета запросов к API.
+    """
+    bot = create_bot(TELEGRAM_TOKEN)
+    warm_up(bot)
+    checkpoints = CheckpointStore(shard_path(CHECKPOINT_FILE, suffix))
+    if suffix:
+        checkpoints.merge(glob.glob(f'{glob.escape(CHECKPOINT_FILE)}*'))
+    status_file = shard_path(STATUS_INDEX_FILE, suffix)
+    outbox_file = shard_path(OUTBOX_FILE, suffix)
+    commands = commands_enabled(suffix)
+    poller = Poller(
+        tenants, bot,
+        checkpoints=checkpoints,
+        statuses=StatusIndex(path=status_file),
+        overlap=STATUS_OVERLAP if status_file else 0,
+        outbox=Outbox(outbox_file) if outbox_file else None,
+        leases=LeaseStore(LEASE_FILE) if LEASE_FILE else None,
+        cards=(
+            CardIndex(path=shard_path(CARD_INDEX_FILE, suffix))
+            if STATUS_CARDS else None
+        ),
+        cache=StatusCache() if commands else None,
+        governor=ApiGovernor(
+            rate=API_RATE / share, max_in_flight=max(1, MAX_IN_FLIGHT // share)
+        )
+    )
+    updater = None
+    if commands:
+        updater = start_commands(
+            TELEGRAM_TOKEN, Commands(poller, poller.cache)
+        )
+
+    logging.info(f'Запущен опрос для пользователей: {len(tenants)}')
+    try:
+        asyncio.run(poller.run_forever())
+    finally:
+        if updater is not None:
+            updater.stop()
+        poller.close()
+        logging.info(f'Соединения с API: {connection_stats()}')
+        logging.info(f'Отправка в телеграмм: {poller.sender.stats()}')
+        close_session()
+
+
+def main():
+    """Опрашивать API для всех пользователей из TENANTS_FILE."""
+    if not (TELEGRAM_TOKEN and TENANTS_FILE):
+        logging.critical("Отсутствует обязательная переменная окружения!")
+        sys.exit()
+
+    run(load_tenants(TENANTS_FILE))
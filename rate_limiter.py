@@ -0,0 +1,288 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+
+from constants import (API_BACKOFF, API_BURST, API_MAX_BACKOFF, API_RATE,
+                       MAX_IN_FLIGHT, TELEGRAM_CHAT_RATE,
+                       TELEGRAM_FLOOD_CHATS, TELEGRAM_GLOBAL_BURST,
+                       TELEGRAM_GLOBAL_RATE, TELEGRAM_GROUP_RATE,
+                       TELEGRAM_SEND_RETRIES)
+
+
+class TokenBucket:
+    """
+    Ведро токенов с резервированием:.
+    каждый вызов reserve занимает следующий свободный слот.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic):
+        """Ведро на capacity токенов пополняется на rate в секунду."""
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def reserve(self):
+        """Занять токен и вернуть, сколько секунд ждать до него."""
+        self._refill()
+        self._tokens -= 1
+
+        if self._tokens >= 0:
+            return 0
+        return -self._tokens / self.rate
+
+    def pause(self, seconds):
+        """Не выдавать токены ближайшие seconds секунд."""
+        self._refill()
+        self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+class ApiGovernor:
+    """
+    Общий бюджет запросов к API Практикума для всех пользователей:.
+    не больше rate запросов в секунду (0 - без ограничения)
+    и max_in_flight одновременно. После ответа 429 все запросы
+    ждут общую паузу, которая растет при повторных 429.
+    """
+
+    def __init__(self, rate=API_RATE, max_in_flight=MAX_IN_FLIGHT,
+                 burst=API_BURST, backoff=API_BACKOFF,
+                 max_backoff=API_MAX_BACKOFF, window=60,
+                 clock=time.monotonic):
+        """Бюджет по умолчанию - из переменных окружения API_*."""
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.window = window
+        self.clock = clock
+        self.bucket = TokenBucket(rate, burst, clock) if rate > 0 else None
+        self.paused_until = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self._penalty = 0
+        self._started = deque()
+        self._semaphore = None
+        self._loop = None
+
+    def _bind(self):
+        """Семафор привязан к циклу событий, в котором создан."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self.in_flight = 0
+
+    def _prune(self, now):
+        while self._started and self._started[0] < now - self.window:
+            self._started.popleft()
+
+    async def acquire(self):
+        """
+        Дождаться своей доли бюджета,.
+        после запроса место освобождается через release.
+        """
+        self._bind()
+        if self.bucket is not None:
+            await asyncio.sleep(self.bucket.reserve())
+
+        await self._semaphore.acquire()
+        try:
+            pause = self.paused_until - self.clock()
+            while pause > 0:
+                await asyncio.sleep(pause)
+                pause = self.paused_until - self.clock()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        now = self.clock()
+        self._started.append(now)
+        self._prune(now)
+        self.requests += 1
+        self.in_flight += 1
+
+    def release(self):
+        """Освободить место, занятое acquire."""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """Дождаться своей доли бюджета и выполнить запрос."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def on_success(self):
+        """Ответ без 429: пауза при следующем 429 снова минимальная."""
+        self._penalty = 0
+
+    def throttle(self, retry_after=None):
+        """Ответ 429: приостановить все запросы."""
+        self.throttled += 1
+        self._penalty += 1
+        delay = retry_after
+        if delay is None:
+            delay = min(
+                self.max_backoff, self.backoff * 2 ** (self._penalty - 1)
+            )
+        self.paused_until = max(self.paused_until, self.clock() + delay)
+        if self.bucket is not None:
+            self.bucket.pause(delay)
+        logging.warning(f'API Практикума ограничило запросы на {delay} с.')
+
+    def utilization(self):
+        """Доля использованного бюджета по частоте и одновременности."""
+        now = self.clock()
+        self._prune(now)
+        return {
+            'rate': (
+                len(self._started) / (self.rate * self.window)
+                if self.rate > 0 else 0
+            ),
+            'concurrency': self.in_flight / self.max_in_flight,
+            'throttled': self.throttled,
+            'paused': max(self.paused_until - now, 0),
+        }
+
+
+def get_retry_after(error):
+    """Значение retry_after из ответа 429, если ошибка вызвана им."""
+    while error is not None:
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            return float(retry_after)
+        error = error.__cause__
+    return None
+
+
+def is_group_chat(chat_id):
+    """У групп и каналов в телеграмме отрицательный id."""
+    return str(chat_id).startswith('-')
+
+
+class SendScheduler:
+    """
+    Отправка сообщений в телеграмм с учетом лимитов:.
+    общего на бота и отдельного на каждый чат.
+    Ответ 429 приостанавливает чат, а если 429 подряд пришли
+    от flood_chats разных чатов - отправку во все чаты.
+    """
+
+    def __init__(self, deliver, global_rate=TELEGRAM_GLOBAL_RATE,
+                 global_burst=TELEGRAM_GLOBAL_BURST,
+                 chat_rate=TELEGRAM_CHAT_RATE, group_rate=TELEGRAM_GROUP_RATE,
+                 retries=TELEGRAM_SEND_RETRIES,
+                 flood_chats=TELEGRAM_FLOOD_CHATS):
+        """deliver(chat_id, message) отправляет сообщение."""
+        self.deliver = deliver
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.retries = retries
+        self.flood_chats = flood_chats
+        self._flooded = set()
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self._chat_buckets = {}
+        self._chat_locks = {}
+        self.queued = 0
+        self.sent = 0
+        self.throttled = 0
+        self.waits = 0
+        self.wait_total = 0
+        self.wait_max = 0
+
+    def _chat_bucket(self, chat_id):
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            rate = self.group_rate if is_group_chat(chat_id) else (
+                self.chat_rate
+            )
+            bucket = self._chat_buckets[chat_id] = TokenBucket(rate)
+        return bucket
+
+    def reset_locks(self):
+        """Сбросить блокировки чатов перед запуском в новом цикле событий."""
+        self._chat_locks = {}
+
+    def _chat_lock(self, chat_id):
+        lock = self._chat_locks.get(chat_id)
+        if lock is None:
+            lock = self._chat_locks[chat_id] = asyncio.Lock()
+        return lock
+
+    async def send(self, chat_id, message, deliver=None):
+        """
+        Дождаться своей очереди и отправить сообщение в чат,.
+        deliver заменяет функцию отправки, например на редактирование.
+        """
+        started = time.monotonic()
+        self.queued += 1
+        try:
+            async with self._chat_lock(chat_id):
+                await asyncio.sleep(self._chat_bucket(chat_id).reserve())
+                await asyncio.sleep(self.global_bucket.reserve())
+                self._record_wait(time.monotonic() - started)
+                return await self._deliver_with_retries(
+                    chat_id, message, deliver or self.deliver
+                )
+        finally:
+            self.queued -= 1
+
+    async def _deliver_with_retries(self, chat_id, message, deliver):
+        for attempt in range(self.retries + 1):
+            try:
+                result = await deliver(chat_id, message)
+            except Exception as error:
+                retry_after = get_retry_after(error)
+                if retry_after is None or attempt == self.retries:
+                    raise
+                self.throttled += 1
+                logging.warning(
+                    f'Превышен лимит телеграмма для чата {chat_id}, '
+                    f'повтор через {retry_after} с.'
+                )
+                self._throttle(chat_id, retry_after)
+                await asyncio.sleep(retry_after)
+            else:
+                self._flooded.clear()
+                self.sent += 1
+                return result
+
+    def _throttle(self, chat_id, retry_after):
+        """Приостановить чат, а при 429 от нескольких чатов - всех."""
+        self._chat_bucket(chat_id).pause(retry_after)
+        self._flooded.add(chat_id)
+        if len(self._flooded) >= self.flood_chats:
+            logging.warning(
+                f'Общий лимит телеграмма, пауза {retry_after} с.'
+            )
+            self.global_bucket.pause(retry_after)
+
+    def _record_wait(self, waited):
+        self.waits += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def stats(self):
+        """Глубина очереди и время ожидания отправки."""
+        return {
+            'queued': self.queued,
+            'sent': self.sent,
+            'throttled': self.throttled,
+            'wait_avg': self.wait_total / self.waits if self.waits else 0,
+            'wait_max': self.wait_max,
+        }
@@ -0,0 +1,164 @@
+"""
+Воспроизведение записанного обмена с API Практикума и телеграммом.
+
+Записанные ответы API проходят через check_response, parse_status
+и send_message, сообщения уходят в заглушку бота.
+
+Пример:
+    python replay.py traffic.jsonl --speed 0
+"""
+import argparse
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+
+from coalescer import SEPARATOR
+from homework import check_response, parse_status, send_message
+from homework_record import MESSAGE_PREFIX
+from traffic import read_traffic
+
+
+class ReplayBot:
+    """Заглушка бота: сообщения запоминаются, а не отправляются."""
+
+    token = 'replay'
+
+    def __init__(self, latency=0):
+        """Каждая отправка занимает latency секунд."""
+        self.latency = latency
+        self.messages = []
+
+    def __getitem__(self, key):
+        """Поля бота, как у telegram.Bot."""
+        return {'username': 'replay'}[key]
+
+    def send_message(self, chat_id, text):
+        """Запомнить сообщение, выждав latency секунд."""
+        if self.latency:
+            time.sleep(self.latency)
+        self.messages.append((chat_id, text))
+        return {'message_id': len(self.messages), 'text': text}
+
+
+class Replay:
+    """
+    Прогон записей по порядку: при speed - с записанными паузами,.
+    ускоренными в speed раз, при speed=0 - без пауз.
+    """
+
+    def __init__(self, bot, speed=1.0, clock=time.monotonic,
+                 sleep=time.sleep):
+        """Сообщения уходят в bot, паузы ускоряются в speed раз."""
+        self.bot = bot
+        self.speed = speed
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = Counter()
+        self.recorded = defaultdict(Counter)
+        self.sent = Counter()
+
+    def _wait(self, started, first, record):
+        if not self.speed:
+            return
+        delay = started + (record['t'] - first) / self.speed - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+
+    def _telegram(self, record):
+        """
+        Отправленные и измененные сообщения - эталон для сравнения,.
+        склеенные сообщения разбиваются обратно на статусы.
+        """
+        if 'e' in record:
+            return
+        for message in record.get('m', '').split(SEPARATOR):
+            if message.startswith(MESSAGE_PREFIX):
+                self.recorded[record.get('c')][message] += 1
+
+    @property
+    def expected(self):
+        """
+        Статусы из записи: при рассылке в несколько чатов.
+        статус учитывается один раз.
+        """
+        expected = Counter()
+        for messages in self.recorded.values():
+            expected |= messages
+        return expected
+
+    def _api(self, record):
+        """Ответ API через check_response, parse_status и send_message."""
+        self.stats['responses'] += 1
+        if 'e' in record:
+            self.stats['api_errors'] += 1
+            return
+        try:
+            homeworks = check_response(record['b'])
+        except Exception as error:
+            logging.warning(f'Ответ не принят: {error}')
+            self.stats['invalid'] += 1
+            return
+
+        for homework in homeworks:
+            self.stats['homeworks'] += 1
+            try:
+                message = parse_status(homework)
+                send_message(self.bot, message)
+            except Exception as error:
+                logging.warning(f'Статус не отправлен: {error}')
+                self.stats['failed'] += 1
+                continue
+            self.sent[message] += 1
+            self.stats['messages'] += 1
+
+    def run(self, records):
+        """Воспроизвести записи, вернуть итоги."""
+        started = self.clock()
+        first = last = None
+        for record in records:
+            if first is None:
+                first = record['t']
+            last = record['t']
+            self._wait(started, first, record)
+            if record['k'] == 'api':
+                self._api(record)
+            elif record['k'] == 'tg':
+                self._telegram(record)
+
+        seconds = self.clock() - started
+        expected = self.expected
+        return {
+            **self.stats,
+            'missing': sum((expected - self.sent).values()),
+            'unexpected': sum((self.sent - expected).values()),
+            'recorded_seconds': round((last or 0) - (first or 0), 3),
+            'seconds': round(seconds, 3),
+            'messages_per_second': (
+                round(self.stats['messages'] / seconds, 1) if seconds else 0
+            ),
+        }
+
+
+def parse_args(argv=None):
+    """Параметры командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('path', help='файл записи TRAFFIC_FILE')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='ускорение пауз, 0 - без пауз')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='задержка отправки в заглушке бота, с.')
+    parser.add_argument('--log-level', default='WARNING')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Воспроизвести запись и вывести итоги."""
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level)
+    replay = Replay(ReplayBot(args.latency), args.speed)
+    print(json.dumps(replay.run(read_traffic(args.path))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+import logging
+import random
+import time
+
+from constants import (BREAKER_FAILURES, BREAKER_RESET_TIMEOUT,
+                       RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+from exceptions import (exception_circuit_open, exception_fatal_error,
+                        exception_retryable_error)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class RetryPolicy:
+    """Экспоненциальная задержка между попытками со случайным разбросом."""
+
+    def __init__(self, attempts=RETRY_ATTEMPTS, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY):
+        """Не больше attempts попыток, паузы от base_delay до max_delay."""
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        """Задержка перед повтором с номером attempt, начиная с нуля."""
+        cap = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return random.uniform(cap / 2, cap)
+
+
+class CircuitBreaker:
+    """
+    Предохранитель: после failures ошибок подряд запросы не выполняются,.
+    через reset_timeout пропускается один пробный запрос.
+    """
+
+    def __init__(self, failures=BREAKER_FAILURES,
+                 reset_timeout=BREAKER_RESET_TIMEOUT, clock=time.monotonic):
+        """Размыкается после failures сбоев на reset_timeout секунд."""
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self._failed = 0
+        self._opened_at = 0
+        self._probing = False
+
+    def before_call(self):
+        """Проверить, можно ли сейчас выполнить запрос."""
+        if self.state == OPEN:
+            if self.clock() - self._opened_at < self.reset_timeout:
+                raise exception_circuit_open(
+                    'API недоступно, запросы временно приостановлены!'
+                )
+            self.state = HALF_OPEN
+            self._probing = False
+            logging.info('Пробный запрос к API после сбоя.')
+
+        if self.state == HALF_OPEN:
+            if self._probing:
+                raise exception_circuit_open(
+                    'Ожидается результат пробного запроса к API!'
+                )
+            self._probing = True
+
+    def on_success(self):
+        """Запрос выполнен: закрыть предохранитель."""
+        if self.state != CLOSED:
+            logging.info('API снова доступно.')
+        self.state = CLOSED
+        self._failed = 0
+        self._probing = False
+
+    def on_abort(self):
+        """
+        Запрос прерван без результата, например отменен:.
+        следующий запрос снова может стать пробным.
+        """
+        self._probing = False
+
+    def on_failure(self):
+        """Запрос не выполнен из-за временной ошибки."""
+        self._failed += 1
+        self._probing = False
+
+        if self.state == HALF_OPEN or self._failed >= self.failures:
+            if self.state != OPEN:
+                logging.error('API недоступно, запросы приостановлены.')
+            self.state = OPEN
+            self._opened_at = self.clock()
+
+
+def _retry_delay(error, attempt, policy, breaker, deadline):
+    """
+    Учесть неудачную попытку и вернуть задержку до следующей,.
+    если повтор не успевает до deadline - пробросить ошибку.
+    """
+    if breaker is not None:
+        breaker.on_failure()
+    if attempt == policy.attempts - 1:
+        raise error
+
+    delay = policy.delay(attempt)
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        raise error
+    logging.warning(f'{error}. Повтор через {delay:.1f} с.')
+    return delay
+
+
+def call_with_retry(func, *args, policy=None, breaker=None,
+                    deadline=None, sleep=time.sleep):
+    """
+    Выполнить func с повторами при временных ошибках до deadline,.
+    постоянные ошибки пробрасываются сразу.
+    """
+    policy = policy or RetryPolicy()
+
+    for attempt in range(policy.attempts):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = func(*args)
+        except exception_retryable_error as error:
+            sleep(
+                _retry_delay(error, attempt, policy, breaker, deadline)
+            )
+        except exception_fatal_error:
+            if breaker is not None:
+                breaker.on_success()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.on_abort()
+            raise
+        else:
+            if breaker is not None:
+                breaker.on_success()
+            return result
+
+
+async def acall_with_retry(func, *args, policy=None, breaker=None,
+                           deadline=None):
+    """Асинхронный вариант call_with_retry для корутины func."""
+    import asyncio
+
+    policy = policy or RetryPolicy()
+
+    for attempt in range(policy.attempts):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = await func(*args)
+        except exception_retryable_error as error:
+            await asyncio.sleep(
+                _retry_delay(error, attempt, policy, breaker, deadline)
+            )
+        except exception_fatal_error:
+            if breaker is not None:
+                breaker.on_success()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.on_abort()
+            raise
+        else:
+            if breaker is not None:
+                breaker.on_success()
+            return result
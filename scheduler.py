@@ -0,0 +1,72 @@
+import random
+import time
+
+from constants import (POLL_IDLE_AFTER, POLL_INTERVAL_MAX, POLL_INTERVAL_MIN,
+                       POLL_JITTER, POLL_SPREAD, RETRY_TIME)
+
+REVIEWING = 'reviewing'
+
+
+class PollSchedule:
+    """
+    Расписание опроса по абсолютным дедлайнам:.
+    чаще, пока работа на проверке, и реже, если давно нет изменений.
+    """
+
+    def __init__(self, base=RETRY_TIME, minimum=POLL_INTERVAL_MIN,
+                 maximum=POLL_INTERVAL_MAX, idle_after=POLL_IDLE_AFTER,
+                 jitter=POLL_JITTER, spread=POLL_SPREAD):
+        """Интервалы опроса - от minimum до maximum вокруг base."""
+        self.base = base
+        self.spread = spread
+        self.minimum = min(minimum, base)
+        self.maximum = max(maximum, base)
+        self.idle_after = idle_after
+        self.jitter = jitter
+        self.overruns = 0
+
+    def observe(self, tenant, homeworks, now=None):
+        """Учесть полученные статусы работ пользователя."""
+        if not homeworks:
+            return
+        tenant.last_activity = now or time.time()
+
+        for homework in homeworks:
+            if homework.status == REVIEWING:
+                tenant.reviewing.add(homework.key)
+            else:
+                tenant.reviewing.discard(homework.key)
+
+    def interval(self, tenant, now=None):
+        """Интервал до следующего опроса пользователя."""
+        if tenant.reviewing:
+            return self.minimum
+
+        idle = (now or time.time()) - tenant.last_activity
+        if idle < self.idle_after:
+            return self.base
+
+        return min(self.maximum, self.base * 2 ** int(idle / self.idle_after))
+
+    def initial_delay(self, tenant=None):
+        """
+        Задержка первого опроса, чтобы развести пользователей:.
+        при spread - постоянная для пользователя доля интервала.
+        """
+        if self.spread and tenant is not None:
+            phase = int(tenant.key, 16) % 1000 / 1000
+            return self.base * self.spread * phase
+        return random.uniform(0, self.base * self.jitter)
+
+    def next_deadline(self, tenant, deadline, now):
+        """
+        Следующий дедлайн отсчитывается от предыдущего, а не от конца.
+        опроса, поэтому время работы цикла не сдвигает расписание.
+        """
+        interval = self.interval(tenant)
+        deadline += interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+        if deadline < now:
+            self.overruns += 1
+            return now
+        return deadline
@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+from constants import STATUS_HISTORY_SIZE
+
+
+class TenantStatuses:
+    """Последние статусы работ пользователя и история их смены."""
+
+    __slots__ = ('seeded', 'updated_at', 'homeworks', 'history')
+
+    def __init__(self, history_size):
+        """История хранит не больше history_size смен статусов."""
+        self.seeded = False
+        self.updated_at = None
+        self.homeworks = OrderedDict()
+        self.history = deque(maxlen=history_size)
+
+
+class StatusCache:
+    """
+    Последние ответы API по пользователям для команд бота,.
+    чтобы отвечать без запросов к Практикуму.
+    """
+
+    def __init__(self, history_size=STATUS_HISTORY_SIZE):
+        """История каждого пользователя - до history_size записей."""
+        self.history_size = history_size
+        self._tenants = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, tenant_key):
+        entry = self._tenants.get(tenant_key)
+        if entry is None:
+            entry = self._tenants[tenant_key] = TenantStatuses(
+                self.history_size
+            )
+        return entry
+
+    def seeded(self, tenant_key):
+        """Загружены ли все работы пользователя."""
+        entry = self._tenants.get(tenant_key)
+        return entry is not None and entry.seeded
+
+    def seed(self, tenant_key, homeworks):
+        """
+        Заполнить кеш всеми работами пользователя после запуска,.
+        без записи в историю, новые статусы не перезаписываются.
+        """
+        homeworks = sorted(
+            homeworks, key=lambda homework: homework.date_updated or ''
+        )
+        with self._lock:
+            entry = self._entry(tenant_key)
+            known = entry.homeworks
+            entry.homeworks = OrderedDict(
+                (homework.key, homework) for homework in homeworks
+                if homework.key not in known
+            )
+            entry.homeworks.update(known)
+            entry.seeded = True
+
+    def update(self, tenant_key, homeworks, now=None):
+        """Учесть работы из ответа API, смены статусов попадают в историю."""
+        now = now or time.time()
+        with self._lock:
+            entry = self._entry(tenant_key)
+            for homework in homeworks:
+                known = entry.homeworks.get(homework.key)
+                if known is None or known.status != homework.status:
+                    entry.history.append((now, homework))
+                entry.homeworks[homework.key] = homework
+                entry.homeworks.move_to_end(homework.key)
+
+    def touch(self, tenant_key, now=None):
+        """Отметить успешный опрос пользователя."""
+        with self._lock:
+            self._entry(tenant_key).updated_at = now or time.time()
+
+    def age(self, tenant_key, now=None):
+        """
+        Сколько секунд назад данные были получены,.
+        None - работы пользователя еще не загружены.
+        """
+        entry = self._tenants.get(tenant_key)
+        if entry is None or not entry.seeded or entry.updated_at is None:
+            return None
+        return (now or time.time()) - entry.updated_at
+
+    def homeworks(self, tenant_key):
+        """Последние известные статусы работ, недавние в конце."""
+        with self._lock:
+            entry = self._tenants.get(tenant_key)
+            return list(entry.homeworks.values()) if entry else []
+
+    def history(self, tenant_key):
+        """Пары (время, работа) смен статусов, недавние в конце."""
+        with self._lock:
+            entry = self._tenants.get(tenant_key)
+            return list(entry.history) if entry else []
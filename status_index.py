@@ -0,0 +1,86 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from checkpoint import atomic_write_json, read_json
+from constants import STATUS_INDEX_SIZE, STATUS_INDEX_TTL
+
+
+def homework_key(tenant, homework):
+    """Ключ работы в индексе: пользователь и id работы."""
+    return f'{tenant}:{homework.key}'
+
+
+class StatusIndex:
+    """
+    Последний известный статус каждой работы.
+    Старые записи вытесняются по LRU и по времени жизни ttl.
+    """
+
+    def __init__(self, max_size=STATUS_INDEX_SIZE, ttl=STATUS_INDEX_TTL,
+                 path=None):
+        """Не больше max_size статусов, каждый хранится ttl секунд."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self._statuses = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+        if path:
+            for key, (status, seen_at) in read_json(path, []):
+                self._statuses[key] = (sys.intern(status), seen_at)
+            self._evict(int(time.time()))
+
+    def __len__(self):
+        """Количество отслеживаемых работ."""
+        return len(self._statuses)
+
+    def is_changed(self, key, status):
+        """Отличается ли статус от последнего известного."""
+        with self._lock:
+            known = self._statuses.get(key)
+        return known is None or known[0] != status
+
+    def remember(self, key, status):
+        """Запомнить статус работы после отправки сообщения."""
+        now = int(time.time())
+        with self._lock:
+            self._statuses[key] = (sys.intern(status), now)
+            self._statuses.move_to_end(key)
+            self._evict(now)
+
+    def _evict(self, now):
+        while len(self._statuses) > self.max_size:
+            self._statuses.popitem(last=False)
+            self.evictions += 1
+
+        expired_before = now - self.ttl
+        while self._statuses:
+            key, (_, seen_at) = next(iter(self._statuses.items()))
+            if seen_at >= expired_before:
+                break
+            del self._statuses[key]
+            self.evictions += 1
+
+    def memory_usage(self):
+        """Примерный объем памяти индекса в байтах."""
+        with self._lock:
+            total = sys.getsizeof(self._statuses)
+            for key, value in self._statuses.items():
+                total += (
+                    sys.getsizeof(key) + sys.getsizeof(value)
+                    + sys.getsizeof(value[1])
+                )
+        return total
+
+    def save(self):
+        """Сохранить индекс на диск, если задан путь."""
+        if not self.path:
+            return
+        with self._lock:
+            items = [
+                [key, list(value)] for key, value in self._statuses.items()
+            ]
+        atomic_write_json(self.path, items)
@@ -0,0 +1,197 @@
+import bisect
+import hashlib
+import logging
+import multiprocessing
+import signal
+import sys
+import time
+
+from constants import (BOT_COMMANDS, LEASE_FILE, LOG_FILE, METRICS_PORT,
+                       METRICS_SNAPSHOT_FILE, METRICS_SNAPSHOT_INTERVAL,
+                       TELEGRAM_TOKEN, TENANTS_FILE, TRAFFIC_FILE, WORKERS,
+                       WORKER_MAX_RESTART_DELAY, WORKER_RESTART_DELAY,
+                       WORKER_VNODES)
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], 'big')
+
+
+class HashRing:
+    """
+    Консистентное хеширование пользователей по обработчикам,.
+    при изменении числа обработчиков переезжает минимум пользователей.
+    """
+
+    def __init__(self, nodes, vnodes=WORKER_VNODES):
+        """Каждый узел занимает vnodes точек на кольце."""
+        points = sorted(
+            (_hash(f'{node}#{replica}'), node)
+            for node in nodes for replica in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key):
+        """Обработчик, которому принадлежит ключ key."""
+        index = bisect.bisect(self._hashes, _hash(key))
+        return self._nodes[index % len(self._nodes)]
+
+
+def shard_tenants(tenants, workers, vnodes=WORKER_VNODES):
+    """Разложить пользователей по номерам обработчиков."""
+    ring = HashRing(range(workers), vnodes)
+    shards = {index: [] for index in range(workers)}
+    for tenant in tenants:
+        shards[ring.node_for(tenant.key)].append(tenant)
+    return shards
+
+
+def _exit(signum, frame):
+    raise SystemExit(0)
+
+
+def start_worker_metrics(index):
+    """
+    Метрики процесса-обработчика: порт METRICS_PORT + 1 + index,.
+    снимок в METRICS_SNAPSHOT_FILE с номером процесса.
+    """
+    from metrics import start_http_server, start_snapshot_writer
+
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT + 1 + index)
+    if METRICS_SNAPSHOT_FILE:
+        start_snapshot_writer(
+            f'{METRICS_SNAPSHOT_FILE}.{index}', METRICS_SNAPSHOT_INTERVAL
+        )
+
+
+def run_worker(index, workers):
+    """
+    Процесс-обработчик: опрос пользователей своей доли,.
+    при LEASE_FILE доли определяются арендой, а не кольцом.
+    """
+    from logging_setup import setup_logging
+    import poller
+
+    signal.signal(signal.SIGTERM, _exit)
+    setup_logging(path=f'{LOG_FILE}.{index}')
+    start_worker_metrics(index)
+    if TRAFFIC_FILE:
+        from traffic import start_capture, traffic_path
+        start_capture(traffic_path(TRAFFIC_FILE, index))
+    tenants = poller.load_tenants(TENANTS_FILE)
+    if not LEASE_FILE:
+        tenants = shard_tenants(tenants, workers)[index]
+    poller.run(tenants, suffix=f'.{index}', share=workers)
+
+
+class Supervisor:
+    """
+    Запускает workers процессов target(index, workers),.
+    и перезапускает упавшие с тем же номером.
+    Пауза перед перезапуском удваивается при каждом падении подряд,
+    до max_restart_delay; процесс, проработавший дольше
+    max_restart_delay, считается здоровым.
+    """
+
+    def __init__(self, target=run_worker, workers=WORKERS,
+                 restart_delay=WORKER_RESTART_DELAY,
+                 max_restart_delay=WORKER_MAX_RESTART_DELAY):
+        """Паузы перезапуска - от restart_delay до max_restart_delay."""
+        self.target = target
+        self.workers = workers
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.restarts = 0
+        self._context = multiprocessing.get_context('spawn')
+        self._processes = {}
+        self._started_at = {}
+        self._died_at = {}
+        self._failures = {}
+        self._stopping = False
+
+    def _start(self, index):
+        process = self._context.Process(
+            target=self.target, args=(index, self.workers),
+            name=f'worker-{index}', daemon=True
+        )
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+        self._died_at.pop(index, None)
+
+    def start(self):
+        """Запустить все процессы-обработчики."""
+        for index in range(self.workers):
+            self._start(index)
+
+    def check(self):
+        """Перезапустить завершившиеся процессы, вернуть их количество."""
+        restarted = 0
+        for index, process in list(self._processes.items()):
+            if self._stopping or process.is_alive():
+                continue
+            now = time.monotonic()
+            if now - self._died_at.setdefault(index, now) < self.delay(index):
+                continue
+            logging.error(
+                f'Обработчик {index} завершился с кодом {process.exitcode}, '
+                f'перезапуск!'
+            )
+            self._failures[index] = self._failures.get(index, 0) + 1
+            self._start(index)
+            restarted += 1
+        self.restarts += restarted
+        return restarted
+
+    def delay(self, index):
+        """Пауза перед перезапуском завершившегося процесса."""
+        uptime = self._died_at[index] - self._started_at[index]
+        if uptime >= self.max_restart_delay:
+            self._failures[index] = 0
+        failures = self._failures.get(index, 0)
+        return min(self.restart_delay * 2 ** failures, self.max_restart_delay)
+
+    def alive(self):
+        """Количество работающих процессов."""
+        return sum(
+            process.is_alive() for process in self._processes.values()
+        )
+
+    def stop(self, timeout=10):
+        """Остановить процессы: дать им сохранить курсоры и завершиться."""
+        self._stopping = True
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+
+    def run_forever(self, interval=1):
+        """Следить за процессами до сигнала остановки."""
+        signal.signal(signal.SIGTERM, _exit)
+        self.start()
+        logging.info(f'Запущено обработчиков: {self.workers}')
+        try:
+            while True:
+                time.sleep(interval)
+                self.check()
+        finally:
+            self.stop()
+
+
+def main():
+    """Опрашивать пользователей из TENANTS_FILE в WORKERS процессах."""
+    if not (TELEGRAM_TOKEN and TENANTS_FILE):
+        logging.critical("Отсутствует обязательная переменная окружения!")
+        sys.exit()
+    if BOT_COMMANDS:
+        logging.warning(
+            'Команды бота не принимаются при WORKERS > 1: '
+            'кеш статусов есть только у процессов-обработчиков!'
+        )
+
+    Supervisor().run_forever()
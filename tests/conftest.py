@@ -1,9 +1,21 @@
 import sys
 from os.path import abspath, dirname
 
+import pytest
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 
 pytest_plugins = [
     'tests.fixtures.fixture_data'
 ]
+
+
+@pytest.fixture
+def session_via_requests(monkeypatch):
+    """Route API calls through `requests.get` so it can be monkeypatched."""
+    import requests
+
+    import homework
+
+    monkeypatch.setattr(homework, 'get_session', lambda: requests)
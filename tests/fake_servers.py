@@ -0,0 +1,242 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class Server(ThreadingHTTPServer):
+    request_queue_size = 1024
+
+
+class FakeServer:
+    """Local HTTP server running in a background thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.server = Server(('127.0.0.1', 0), self.handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def handler(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakePracticum(FakeServer):
+    """Stand-in for the homework_statuses endpoint."""
+
+    path = '/api/user_api/homework_statuses/'
+
+    def __init__(self, homeworks_by_token=None, latency=0, failures=0,
+                 error_rate=0, record=True, throttled=0, retry_after=1):
+        self.homeworks_by_token = homeworks_by_token or {}
+        self.throttled = throttled
+        self.retry_after = retry_after
+        self.latency = latency
+        self.failures = failures
+        self.error_rate = error_rate
+        self.record = record
+        self.requests = []
+        self.served = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        super().__init__()
+
+    @property
+    def endpoint(self):
+        return self.url + self.path
+
+    def handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with fake.lock:
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(
+                        fake.max_in_flight, fake.in_flight
+                    )
+                try:
+                    fake.handle_get(self)
+                finally:
+                    with fake.lock:
+                        fake.in_flight -= 1
+
+        return Handler
+
+    def handle_get(self, request):
+        token = request.headers.get('Authorization', '')[len('OAuth '):]
+        query = parse_qs(urlparse(request.path).query)
+        with self.lock:
+            self.served += 1
+            if self.record:
+                self.requests.append((token, query))
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self.lock:
+            throttled = self.throttled > 0
+            self.throttled -= throttled
+            failed = self.failures > 0
+            self.failures -= failed
+        if throttled:
+            return self.reply(
+                request, 429, {'detail': 'Too Many Requests'},
+                {'Retry-After': str(self.retry_after)}
+            )
+        if failed or random.random() < self.error_rate:
+            return self.reply(request, 502, {'error': 'Bad Gateway'})
+        if token not in self.homeworks_by_token:
+            return self.reply(request, 401, {'code': 'not_authenticated'})
+        return self.reply(request, 200, {
+            'homeworks': self.homeworks_by_token[token],
+            'current_date': int(time.time()),
+        })
+
+    @staticmethod
+    def reply(request, status, data, headers=None):
+        body = json.dumps(data).encode()
+        request.send_response(status)
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+class FakeTelegram(FakeServer):
+    """Stand-in for the Telegram Bot API."""
+
+    token = '123456:fake-token'
+
+    def __init__(self, flood_responses=0, retry_after=1, failures=0,
+                 latency=0, flood_rate=0, record=True):
+        self.messages = []
+        self.texts = {}
+        self.edits = []
+        self.methods = []
+        self.message_id = 0
+        self.failures = failures
+        self.latency = latency
+        self.flood_rate = flood_rate
+        self.record = record
+        self.sent = 0
+        self.flood_responses = flood_responses
+        self.retry_after = retry_after
+        super().__init__()
+
+    @property
+    def base_url(self):
+        return self.url + '/bot'
+
+    def handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                data = json.loads(self.rfile.read(length) or b'{}')
+                method = self.path.rsplit('/', 1)[-1]
+                fake.handle_method(self, method, data)
+
+        return Handler
+
+    def handle_method(self, request, method, data):
+        with self.lock:
+            self.methods.append(method)
+        if self.latency:
+            time.sleep(self.latency)
+        if method == 'sendMessage' and random.random() < self.flood_rate:
+            with self.lock:
+                self.flood_responses += 1
+
+        if method == 'getMe':
+            result = {
+                'id': 1, 'is_bot': True,
+                'first_name': 'bot', 'username': 'fake_bot',
+            }
+        elif method == 'sendMessage' and self.failures:
+            with self.lock:
+                self.failures -= 1
+            return FakePracticum.reply(request, 500, {
+                'ok': False, 'error_code': 500,
+                'description': 'Internal Server Error',
+            })
+        elif method == 'sendMessage' and self.flood_responses:
+            with self.lock:
+                self.flood_responses -= 1
+            return FakePracticum.reply(request, 429, {
+                'ok': False, 'error_code': 429,
+                'description': 'Too Many Requests',
+                'parameters': {'retry_after': self.retry_after},
+            })
+        elif method == 'sendMessage':
+            with self.lock:
+                self.message_id += 1
+                self.sent += 1
+                if self.record:
+                    self.messages.append((str(data['chat_id']), data['text']))
+                    self.texts[self.message_id] = data['text']
+                message_id = self.message_id
+            result = {
+                'message_id': message_id,
+                'date': int(time.time()),
+                'chat': {'id': int(data['chat_id']), 'type': 'private'},
+                'text': data['text'],
+            }
+        elif method == 'editMessageText':
+            return self.edit_message(request, data)
+        else:
+            return FakePracticum.reply(
+                request, 404, {'ok': False, 'description': 'Not Found'}
+            )
+        return FakePracticum.reply(request, 200, {'ok': True, 'result': result})
+
+    def edit_message(self, request, data):
+        message_id = int(data['message_id'])
+        with self.lock:
+            text = self.texts.get(message_id)
+            if text is not None and text != data['text']:
+                self.texts[message_id] = data['text']
+                self.edits.append((message_id, data['text']))
+        if text is None or text == data['text']:
+            description = (
+                'Bad Request: message to edit not found' if text is None
+                else 'Bad Request: message is not modified'
+            )
+            return FakePracticum.reply(request, 400, {
+                'ok': False, 'error_code': 400, 'description': description,
+            })
+        return FakePracticum.reply(request, 200, {'ok': True, 'result': {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': int(data['chat_id']), 'type': 'private'},
+            'text': data['text'],
+        }})
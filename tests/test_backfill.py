@@ -0,0 +1,46 @@
+import io
+import json
+
+
+def test_backfill_streams_history_to_jsonl(tmp_path):
+    import backfill
+    import poller
+    import status_index
+    from fake_servers import FakePracticum
+    from homework_record import HomeworkRecord
+
+    homeworks_by_token = {
+        f'token-{number}': [
+            {'id': number * 10 + item, 'homework_name': f'hw{item}.zip',
+             'status': 'approved', 'reviewer_comment': 'x' * 100}
+            for item in range(3)
+        ]
+        for number in range(10)
+    }
+    tenants = [poller.Tenant(token, '1') for token in homeworks_by_token]
+    tenants.append(poller.Tenant('revoked-token', '1'))
+    statuses = status_index.StatusIndex(path=str(tmp_path / 'statuses.json'))
+    output = io.StringIO()
+
+    with FakePracticum(homeworks_by_token) as practicum:
+        result = backfill.backfill(
+            tenants, output, endpoint=practicum.endpoint, max_in_flight=3,
+            statuses=statuses
+        )
+
+    assert result['homeworks'] == 30
+    assert result['failed'] == 1
+    assert practicum.max_in_flight <= 3
+    assert {query['from_date'][0] for _, query in practicum.requests} == {'0'}
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(records) == 30
+    assert 'reviewer_comment' not in records[0]
+    assert set(records[0]) == {'tenant', 'id', 'homework_name', 'status'}
+
+    reloaded = status_index.StatusIndex(path=statuses.path)
+    assert len(reloaded) == 30
+    assert not reloaded.is_changed(
+        status_index.homework_key(tenants[0].key, HomeworkRecord(id=1)),
+        'approved'
+    )
@@ -0,0 +1,22 @@
+import json
+import subprocess
+import sys
+from os.path import abspath, dirname, join
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+
+def test_bench_reports_comparable_json(tmp_path):
+    output = tmp_path / 'bench.jsonl'
+    subprocess.run(
+        [sys.executable, join(ROOT, 'benchmarks', 'bench.py'),
+         '--tenants', '5', '--cycles', '2', '--homeworks', '2',
+         '--output', str(output)],
+        check=True, capture_output=True, timeout=60
+    )
+    result = json.loads(output.read_text())
+    assert result['messages_sent'] == 10
+    assert result['config']['tenants'] == 5
+    for key in ('cycles_per_second', 'messages_per_second',
+                'poll_latency_p50', 'poll_latency_p99', 'max_rss_kb'):
+        assert result[key] > 0
@@ -1,10 +1,13 @@
 import os
 from http import HTTPStatus
 
+import pytest
 import requests
 import telegram
 import utils
 
+pytestmark = pytest.mark.usefixtures('session_via_requests')
+
 
 class MockResponseGET:
 
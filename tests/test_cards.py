@@ -0,0 +1,51 @@
+import asyncio
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import poller_engine
+
+
+def test_card_index_persists_and_expires(tmp_path, monkeypatch):
+    import cards
+
+    path = str(tmp_path / 'cards.json')
+    index = cards.CardIndex(max_size=2, max_age=60, path=path)
+    for number in range(3):
+        index.set('1', number, 100 + number)
+    index.save()
+
+    reloaded = cards.CardIndex(max_age=60, path=path)
+    assert len(reloaded) == 2
+    assert reloaded.get('1', 0) is None
+    assert reloaded.get('1', 2) == 102
+
+    now = cards.time.time()
+    monkeypatch.setattr(cards.time, 'time', lambda: now + 120)
+    assert reloaded.get('1', 2) is None
+
+
+def test_poller_edits_status_card_in_place():
+    import cards
+    import poller
+    import status_index
+
+    homework = {'id': 1, 'homework_name': 'hw.zip', 'status': 'reviewing'}
+    with FakePracticum({'token': [homework]}) as practicum, \
+            FakeTelegram() as telegram_api:
+        with poller_engine(
+            [poller.Tenant('token', '1')], practicum, telegram_api,
+            statuses=status_index.StatusIndex(), cards=cards.CardIndex()
+        ) as engine:
+            for status in ('reviewing', 'rejected', 'reviewing', 'approved'):
+                homework['status'] = status
+                asyncio.run(engine.run_once())
+
+            telegram_api.texts.clear()
+            homework['status'] = 'rejected'
+            asyncio.run(engine.run_once())
+
+    assert len(telegram_api.messages) == 2
+    assert [text for _, text in telegram_api.edits] == [
+        poller.parse_status(dict(homework, status=status))
+        for status in ('rejected', 'reviewing', 'approved')
+    ]
+    assert telegram_api.messages[-1][1] == poller.parse_status(homework)
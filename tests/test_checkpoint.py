@@ -0,0 +1,102 @@
+from fake_servers import FakePracticum, FakeTelegram
+from utils import run_poller
+
+
+def test_checkpoint_store_coalesces_writes(tmp_path):
+    import checkpoint
+
+    path = tmp_path / 'checkpoints.json'
+    store = checkpoint.CheckpointStore(str(path), flush_interval=60)
+    for number in range(100):
+        store.set(f'tenant-{number}', number)
+    store.flush(force=True)
+    store.set('tenant-1', 1)
+    assert not store.flush(force=True)
+    store.set('tenant-1', 1000)
+    assert not store.flush()
+
+    assert store.writes == 1
+    reloaded = checkpoint.CheckpointStore(str(path))
+    assert reloaded.get('tenant-99') == 99
+    assert reloaded.get('tenant-1') == 1
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_poller_resumes_from_checkpoint(tmp_path):
+    import checkpoint
+    import poller
+
+    path = str(tmp_path / 'checkpoints.json')
+    tenant = poller.Tenant('token', '1')
+    store = checkpoint.CheckpointStore(path)
+    store.set(tenant.key, 12345)
+    store.flush(force=True)
+
+    with FakePracticum({'token': []}) as practicum, \
+            FakeTelegram() as telegram_api:
+        run_poller(
+            [poller.Tenant('token', '1')], practicum, telegram_api,
+            checkpoints=checkpoint.CheckpointStore(path)
+        )
+
+    assert practicum.requests[0][1]['from_date'] == ['12345']
+    saved = checkpoint.CheckpointStore(path).get(tenant.key)
+    assert saved > 12345
+
+
+def test_poller_restores_activity_from_checkpoint(tmp_path):
+    import json
+
+    import checkpoint
+    import poller
+
+    path = tmp_path / 'checkpoints.json'
+    tenant = poller.Tenant('token', '1')
+    path.write_text(json.dumps({tenant.key: 12345}))
+
+    store = checkpoint.CheckpointStore(str(path))
+    assert store.get(tenant.key) == 12345
+    assert store.get_activity(tenant.key) is None
+    store.set_activity(tenant.key, 1000.5, {2, 1})
+    store.flush(force=True)
+
+    engine = poller.Poller(
+        [tenant], None, checkpoints=checkpoint.CheckpointStore(str(path))
+    )
+    engine.close()
+
+    assert tenant.current_timestamp == 12345
+    assert tenant.last_activity == 1000
+    assert tenant.reviewing == {1, 2}
+    assert engine.schedule.interval(tenant) == engine.schedule.minimum
+
+
+def test_checkpoint_set_does_not_wait_for_disk(tmp_path, monkeypatch):
+    import threading
+
+    import checkpoint
+
+    writing, release = threading.Event(), threading.Event()
+    write = checkpoint.atomic_write_json
+
+    def slow_write(path, data):
+        writing.set()
+        release.wait(5)
+        write(path, data)
+
+    monkeypatch.setattr(checkpoint, 'atomic_write_json', slow_write)
+    store = checkpoint.CheckpointStore(str(tmp_path / 'checkpoints.json'))
+    store.set('tenant', 1)
+    flusher = threading.Thread(target=store.flush, args=(True,))
+    flusher.start()
+    assert writing.wait(5)
+
+    setter = threading.Thread(target=store.set, args=('tenant', 2))
+    setter.start()
+    setter.join(1)
+    assert not setter.is_alive()
+    release.set()
+    flusher.join()
+
+    assert store.flush(force=True)
+    assert checkpoint.CheckpointStore(store.path).get('tenant') == 2
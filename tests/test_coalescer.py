@@ -0,0 +1,54 @@
+import asyncio
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import run_poller
+
+
+def test_join_messages_respects_limit():
+    import coalescer
+
+    assert coalescer.join_messages(['a', 'b', 'c']) == ['a\n\nb\n\nc']
+    assert coalescer.join_messages(['aaaa', 'bbbb'], limit=8) == [
+        'aaaa', 'bbbb'
+    ]
+    assert coalescer.join_messages(['a', 'bbbbbbbbbb'], limit=4) == [
+        'a', 'bbbb', 'bbbb', 'bb'
+    ]
+    parts = coalescer.join_messages(['x' * 100] * 100)
+    assert all(len(part) <= 4096 for part in parts)
+    assert len(parts) == 3
+
+
+def test_coalescer_groups_chat_messages_within_window():
+    import coalescer
+
+    sent = []
+
+    async def send(chat_id, message):
+        sent.append((chat_id, message))
+
+    async def run():
+        batcher = coalescer.Coalescer(send, window=0.05)
+        first = batcher.add('1', 'a')
+        await asyncio.sleep(0.01)
+        await asyncio.gather(first, batcher.add('1', 'b'),
+                             batcher.add('2', 'c'))
+
+    asyncio.run(run())
+    assert sorted(sent) == [('1', 'a\n\nb'), ('2', 'c')]
+
+
+def test_poller_sends_one_message_per_cycle():
+    import poller
+
+    homeworks = {'token': [
+        {'homework_name': 'hw1', 'status': 'approved'},
+        {'homework_name': 'hw2', 'status': 'rejected'},
+    ]}
+    with FakePracticum(homeworks) as practicum, \
+            FakeTelegram() as telegram_api:
+        run_poller([poller.Tenant('token', '1')], practicum, telegram_api)
+
+    assert len(telegram_api.messages) == 1
+    assert '"hw1"' in telegram_api.messages[0][1]
+    assert '"hw2"' in telegram_api.messages[0][1]
@@ -0,0 +1,135 @@
+import asyncio
+from types import SimpleNamespace
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import poller_engine
+
+
+def make_poller(practicum, telegram_api, **kwargs):
+    import poller
+    import status_cache
+
+    return poller_engine(
+        [poller.Tenant('token', '1', subscribers=['2'])], practicum,
+        telegram_api, cache=status_cache.StatusCache(), **kwargs
+    )
+
+
+def test_commands_answer_from_cache():
+    import commands
+
+    homework = {'id': 1, 'homework_name': 'hw.zip', 'status': 'reviewing'}
+    with FakePracticum({'token': [homework]}) as practicum, \
+            FakeTelegram() as telegram_api:
+        with make_poller(practicum, telegram_api) as engine:
+            handlers = commands.Commands(engine, engine.cache)
+            assert 'еще не получены' in handlers.status('1')
+            asyncio.run(engine.run_once())
+            homework['status'] = 'approved'
+            asyncio.run(engine.run_once())
+
+    requests_made = len(practicum.requests)
+    answer = handlers.status('2', refresh=True)
+    assert answer.startswith('Изменился статус')
+    assert 'ревьюеру всё понравилось' in answer
+    assert 'Данные получены 0 с. назад.' in answer
+    assert 'обновление не требуется' in answer
+    assert handlers.history('1').splitlines()[-1].endswith('hw.zip: approved')
+    assert handlers.status('3') == 'Чат не подписан на статусы работ.'
+    assert len(practicum.requests) == requests_made
+
+    replies = []
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=1),
+        effective_message=SimpleNamespace(reply_text=replies.append)
+    )
+    handlers.on_history(update, SimpleNamespace(args=[]))
+    assert replies == [handlers.history('1')]
+
+
+def test_refresh_pulls_scheduled_poll_forward():
+    import commands
+
+    with FakePracticum({'token': []}, latency=0.3) as practicum, \
+            FakeTelegram() as telegram_api, \
+            make_poller(practicum, telegram_api, retry_time=1000) as engine:
+        engine.schedule.jitter = 0
+        handlers = commands.Commands(engine, engine.cache, refresh_min_age=0)
+
+        async def scenario():
+            task = asyncio.ensure_future(engine.run_forever())
+            while not engine.cache.age(engine.tenants[0].key):
+                await asyncio.sleep(0.01)
+            polled = len(practicum.requests)
+            answers = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: [
+                    handlers.status('1', refresh=True) for _ in range(3)
+                ]
+            )
+            while len(practicum.requests) < polled + 1:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.2)
+            task.cancel()
+            return answers, polled
+
+        answers, polled = asyncio.run(asyncio.wait_for(scenario(), 10))
+
+    assert all('Обновление запрошено' in answer for answer in answers)
+    assert polled == 2
+    assert len(practicum.requests) == polled + 1
+
+
+def test_cache_is_seeded_with_full_history_after_restart():
+    import commands
+    from homework_record import HomeworkRecord
+
+    homework = {'id': 1, 'homework_name': 'old.zip', 'status': 'approved'}
+    with FakePracticum({'token': [homework]}) as practicum, \
+            FakeTelegram() as telegram_api:
+        with make_poller(practicum, telegram_api) as engine:
+            handlers = commands.Commands(engine, engine.cache)
+            tenant = engine.tenants[0]
+            engine.cache.touch(tenant.key)
+            assert engine.cache.age(tenant.key) is None
+            asyncio.run(engine.run_once())
+            asyncio.run(engine.run_once())
+
+    from_dates = [query['from_date'][0] for _, query in practicum.requests]
+    assert from_dates[0] == '1'
+    assert len(from_dates) == 3
+    assert 'old.zip' in handlers.status('1')
+    assert 'Данные получены 0 с. назад.' in handlers.status('1')
+
+    engine.cache.seed(tenant.key, [HomeworkRecord(1, 'old.zip', 'rejected')])
+    assert engine.cache.homeworks(tenant.key)[0].status == 'approved'
+
+
+def test_webhook_requires_public_url():
+    import commands
+    import pytest
+    from exceptions import exception_fatal_error
+
+    with pytest.raises(exception_fatal_error):
+        commands.start_commands(
+            '123456:fake-token', None, webhook_port=8443, webhook_url=None
+        )
+
+
+def test_seed_is_not_retried_after_fatal_error():
+    with FakePracticum({}) as practicum, FakeTelegram() as telegram_api:
+        with make_poller(practicum, telegram_api) as engine:
+            for _ in range(3):
+                asyncio.run(engine.run_once())
+
+    assert len(practicum.requests) == 4
+    assert engine.cache.seeded(engine.tenants[0].key)
+
+
+def test_commands_disabled_with_leases(monkeypatch):
+    import poller
+
+    monkeypatch.setattr(poller, 'BOT_COMMANDS', True)
+    assert poller.commands_enabled()
+    assert not poller.commands_enabled('.0')
+    monkeypatch.setattr(poller, 'LEASE_FILE', 'leases.sqlite3')
+    assert not poller.commands_enabled()
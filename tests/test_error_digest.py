@@ -0,0 +1,39 @@
+from utils import FakeClock
+
+
+def test_fingerprint_ignores_volatile_numbers():
+    import error_digest
+
+    first = ValueError('502. Ошибка запроса 1700000000 at 0x7f00aa')
+    second = ValueError('502. Ошибка запроса 1700000600 at 0x7f00bb')
+    assert error_digest.fingerprint(first) == error_digest.fingerprint(second)
+    assert '502' in error_digest.fingerprint(first)
+    assert error_digest.fingerprint(first) != error_digest.fingerprint(
+        KeyError('502. Ошибка запроса 1700000000 at 0x7f00aa')
+    )
+
+
+def test_aggregator_sends_one_digest_per_window():
+    import error_digest
+
+    clock = FakeClock()
+    errors = error_digest.ErrorAggregator(window=3600, clock=clock)
+    bad_gateway = ValueError('502')
+    timeout = ValueError('408')
+
+    assert errors.record(bad_gateway) == ['Сбой в работе программы: 502']
+    assert errors.record(timeout) == ['Сбой в работе программы: 408']
+    for minute in range(1, 47):
+        clock.now = minute * 60
+        assert errors.record(bad_gateway) == []
+        assert errors.record(timeout) == []
+
+    clock.now = 3600
+    digests = errors.record(bad_gateway)
+    assert digests == [
+        'Сбой в работе программы: 502 x47 за последние 60 мин.',
+        'Сбой в работе программы: 408 x46 за последние 60 мин.',
+    ]
+
+    assert errors.resolve() == 'Работа программы восстановлена.'
+    assert errors.resolve() is None
@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import poller_engine
+
+
+def test_governor_limits_request_rate():
+    from rate_limiter import ApiGovernor
+
+    governor = ApiGovernor(rate=20, burst=1, max_in_flight=10)
+
+    async def request():
+        async with governor.slot():
+            pass
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    started = time.monotonic()
+    asyncio.run(run())
+
+    assert time.monotonic() - started >= 0.2
+    assert governor.requests == 6
+    assert governor.utilization()['concurrency'] == 0
+
+
+def test_governor_backoff_grows_without_retry_after():
+    from rate_limiter import ApiGovernor
+
+    now = [100.0]
+    governor = ApiGovernor(backoff=5, max_backoff=12, clock=lambda: now[0])
+
+    governor.throttle()
+    assert governor.paused_until == 105
+    governor.throttle()
+    assert governor.paused_until == 110
+    governor.throttle()
+    assert governor.paused_until == 112
+
+    governor.on_success()
+    governor.throttle(retry_after=1)
+    assert governor.paused_until == 112
+    assert governor.utilization()['throttled'] == 4
+
+
+def test_poller_pauses_all_tenants_on_429():
+    import poller
+    from rate_limiter import ApiGovernor
+
+    tokens = {f'token-{number}': [] for number in range(5)}
+    with FakePracticum(tokens, throttled=1, retry_after=0.5) as practicum, \
+            FakeTelegram() as telegram_api:
+        tenants = [poller.Tenant(token, '1') for token in tokens]
+        governor = ApiGovernor(max_in_flight=1)
+        with poller_engine(
+            tenants, practicum, telegram_api, governor=governor
+        ) as engine:
+            started = time.monotonic()
+            asyncio.run(engine.run_once())
+
+    assert time.monotonic() - started >= 0.5
+    assert governor.throttled == 1
+    assert len(practicum.requests) == 6
+    assert all(tenant.current_timestamp for tenant in tenants)
+    assert telegram_api.messages == []
+
+
+def test_schedule_spread_is_deterministic():
+    import poller
+    from scheduler import PollSchedule
+
+    schedule = PollSchedule(base=600, spread=1)
+    first, second = poller.Tenant('a', '1'), poller.Tenant('b', '1')
+
+    assert schedule.initial_delay(first) == schedule.initial_delay(first)
+    assert 0 <= schedule.initial_delay(first) < 600
+    assert schedule.initial_delay(first) != schedule.initial_delay(second)
+
+
+def test_cancelled_request_keeps_its_slot_until_finished():
+    import poller
+    from rate_limiter import ApiGovernor
+
+    with FakePracticum({'token': []}, latency=0.3) as practicum, \
+            FakeTelegram() as telegram_api:
+        tenant = poller.Tenant('token', '1')
+        governor = ApiGovernor(max_in_flight=1)
+
+        async def scenario(engine):
+            for _ in range(3):
+                try:
+                    await asyncio.wait_for(
+                        engine._request_once(tenant, 1), 0.05
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            while governor.in_flight:
+                await asyncio.sleep(0.05)
+
+        with poller_engine(
+            [tenant], practicum, telegram_api, max_in_flight=4,
+            governor=governor
+        ) as engine:
+            asyncio.run(scenario(engine))
+
+    assert len(practicum.requests) == 1
+    assert practicum.max_in_flight == 1
+
+
+def test_stream_keeps_its_slot_until_closed():
+    import poller
+    from json_stream import HomeworkStream
+    from rate_limiter import ApiGovernor
+
+    with FakePracticum({'token': []}) as practicum, \
+            FakeTelegram() as telegram_api:
+        tenant = poller.Tenant('token', '1')
+        governor = ApiGovernor(max_in_flight=1)
+
+        async def scenario(engine):
+            response = await engine._request_once(tenant, 1)
+            assert isinstance(response, HomeworkStream)
+            await asyncio.sleep(0.05)
+            assert governor.in_flight == 1
+            await engine._call(list, response)
+            await asyncio.sleep(0.05)
+            assert governor.in_flight == 0
+
+        with poller_engine(
+            [tenant], practicum, telegram_api, governor=governor, stream=True
+        ) as engine:
+            asyncio.run(scenario(engine))
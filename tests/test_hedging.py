@@ -0,0 +1,66 @@
+import asyncio
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import poller_engine, run_poller
+
+
+def test_latency_tracker_threshold():
+    import hedging
+
+    tracker = hedging.LatencyTracker(min_samples=10)
+    assert tracker.threshold() is None
+    for number in range(100):
+        tracker.add(number / 100)
+    assert tracker.threshold() == 0.95
+
+
+def test_hedged_returns_fastest_answer():
+    import hedging
+
+    delays = [0.5, 0.01]
+
+    async def call():
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return delay
+
+    stats = {'hedged': 0, 'hedge_wins': 0}
+    result = asyncio.run(hedging.hedged(call, 0.05, stats))
+    assert result == 0.01
+    assert stats == {'hedged': 1, 'hedge_wins': 1}
+
+
+def test_request_timeout_is_bounded(monkeypatch):
+    import homework
+    import poller
+
+    monkeypatch.setattr(homework, 'API_READ_TIMEOUT', 0.1)
+    with FakePracticum({'token': []}, latency=0.5) as practicum, \
+            FakeTelegram() as telegram_api:
+        with poller_engine(
+            [poller.Tenant('token', '1')], practicum, telegram_api,
+            cycle_deadline=0.3
+        ) as engine:
+            started = homework.time.monotonic()
+            asyncio.run(engine.run_once())
+            elapsed = homework.time.monotonic() - started
+
+    assert elapsed < 1
+    assert telegram_api.messages[0][1].startswith('Сбой в работе программы')
+
+
+def test_slow_delivery_does_not_count_against_deadline():
+    import poller
+    import status_index
+
+    homeworks = {'token': [{'id': 1, 'homework_name': 'hw.zip',
+                            'status': 'approved'}]}
+    with FakePracticum(homeworks) as practicum, \
+            FakeTelegram(flood_responses=1, retry_after=1.5) as telegram_api:
+        run_poller(
+            [poller.Tenant('token', '1')], practicum, telegram_api, cycles=2,
+            statuses=status_index.StatusIndex(), cycle_deadline=0.5
+        )
+
+    assert len(telegram_api.messages) == 1
+    assert telegram_api.messages[0][1].startswith('Изменился статус')
@@ -0,0 +1,49 @@
+import json
+import tracemalloc
+
+
+def allocated(build):
+    tracemalloc.start()
+    try:
+        items = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert items
+    return size
+
+
+def test_records_use_less_memory_than_dicts():
+    from homework_record import HomeworkRecord
+
+    body = json.dumps([
+        {'id': number, 'homework_name': f'hw{number}.zip',
+         'status': 'approved', 'date_updated': '2020-02-13T14:40:57Z',
+         'reviewer_comment': 'Всё нравится', 'lesson_name': 'Итоговый проект'}
+        for number in range(10000)
+    ])
+
+    dicts = allocated(lambda: json.loads(body))
+    records = allocated(
+        lambda: [HomeworkRecord.from_dict(item) for item in json.loads(body)]
+    )
+    assert records < dicts / 2
+
+
+def test_records_intern_statuses_and_render_messages():
+    import homework
+    from homework_record import HomeworkRecord
+
+    first, second = (
+        HomeworkRecord.from_dict(json.loads(
+            '{"homework_name": "hw.zip", "status": "approved"}'
+        ))
+        for _ in range(2)
+    )
+    assert first.status is second.status
+    assert homework.parse_status(first) == homework.parse_status(
+        {'homework_name': 'hw.zip', 'status': 'approved'}
+    )
+    assert homework.check_response(
+        {'homeworks': [first.as_dict(), 'broken'], 'current_date': 1}
+    ) == [first, HomeworkRecord()]
@@ -0,0 +1,29 @@
+from fake_servers import FakePracticum
+
+
+def test_session_reuses_connections():
+    import homework
+    import http_session
+
+    session = http_session.create_session(pool_maxsize=2)
+    with FakePracticum({'token': []}) as practicum:
+        for _ in range(5):
+            response = session.get(
+                practicum.endpoint,
+                headers={'Authorization': 'OAuth token'},
+                params={'from_date': 0}
+            )
+            assert response.status_code == 200
+        stats = http_session.connection_stats(session)
+    session.close()
+
+    assert stats == {'connections': 1, 'requests': 5, 'reused': 4}
+    assert homework.get_session() is http_session.get_session()
+
+
+def test_session_accepts_gzip():
+    import http_session
+
+    session = http_session.create_session()
+    assert 'gzip' in session.headers['Accept-Encoding']
+    assert http_session.connection_stats(session)['requests'] == 0
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import run_poller
+
+
+def chunked(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 7, 4096])
+def test_stream_yields_homeworks_one_by_one(size):
+    import json_stream
+
+    homeworks = [
+        {'id': number, 'status': 'approved', 'homework_name': f'ф{number}'}
+        for number in range(100)
+    ]
+    data = json.dumps({
+        'homeworks': homeworks, 'current_date': 1234567890,
+    }).encode()
+    chunks = iter(chunked(data, size))
+    stream = json_stream.HomeworkStream(chunks)
+
+    first = next(iter(stream))
+    assert first.as_dict() == homeworks[0]
+    assert next(chunks, None) is not None
+
+    stream = json_stream.HomeworkStream(chunked(data, size))
+    assert [
+        item.as_dict() for batch in stream.batches() for item in batch
+    ] == homeworks
+    assert stream.get('current_date') == 1234567890
+    assert 'homeworks' not in stream.fields
+
+
+@pytest.mark.parametrize('body, error', [
+    (b'[]', 'exception_type_error'),
+    (b'{"current_date": 1}', 'exception_key_error'),
+    (b'{"homeworks": {}}', 'exception_type_error'),
+    (b'{"homeworks": [{"id": 1},', 'exception_retryable_error'),
+])
+def test_stream_rejects_invalid_response(body, error):
+    import json_stream
+
+    closed = []
+    stream = json_stream.HomeworkStream(
+        chunked(body, 3), close=lambda: closed.append(True)
+    )
+    with pytest.raises(Exception) as info:
+        list(stream)
+    assert type(info.value).__name__ == error
+    assert closed == [True]
+
+
+def test_poller_streams_long_history():
+    import poller
+
+    homeworks = [
+        {'id': number, 'homework_name': f'hw{number}.zip',
+         'status': 'approved'}
+        for number in range(100)
+    ]
+    with FakePracticum({'token': homeworks}) as practicum, \
+            FakeTelegram() as telegram_api:
+        tenant = poller.Tenant('token', '1')
+        run_poller([tenant], practicum, telegram_api, stream=True)
+
+    text = '\n\n'.join(message for _, message in telegram_api.messages)
+    assert text.count('hw') == 100
+    assert tenant.current_timestamp > 1234567890
@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import poller_engine, run_poller
+
+
+def test_leases_split_shards_between_nodes(tmp_path):
+    import leases
+
+    path = str(tmp_path / 'leases.sqlite3')
+    first = leases.LeaseStore(path, owner='a', shards=8)
+    second = leases.LeaseStore(path, owner='b', shards=8)
+
+    assert len(first.sync()) == 8
+    assert second.sync() == frozenset()
+    assert len(first.sync(keep={0, 1, 2, 3, 4})) == 5
+    assert len(second.sync()) == 3
+    assert len(first.sync()) == 4
+    assert len(second.sync()) == 4
+    assert first.owned | second.owned == frozenset(range(8))
+    assert not first.owned & second.owned
+
+
+def test_leases_expired_are_taken_over(tmp_path):
+    import leases
+
+    path = str(tmp_path / 'leases.sqlite3')
+    crashed = leases.LeaseStore(path, owner='a', shards=4, ttl=0.2)
+    crashed.sync({'0a': 100})
+    other = leases.LeaseStore(path, owner='b', shards=4)
+    assert other.sync() == frozenset()
+
+    time.sleep(0.3)
+    assert not crashed.owns('0a')
+    assert len(other.sync()) == 4
+    assert other.cursors(['0a', 'ff']) == {'0a': 100}
+
+
+def test_new_node_resumes_from_previous_owner_cursor(tmp_path):
+    import leases
+    import poller
+    import status_index
+
+    tokens = [f'token-{number}' for number in range(5)]
+    path = str(tmp_path / 'leases.sqlite3')
+    with FakePracticum({token: [] for token in tokens}) as practicum, \
+            FakeTelegram() as telegram_api:
+        old = run_poller(
+            [poller.Tenant(token, '1') for token in tokens], practicum,
+            telegram_api, leases=leases.LeaseStore(path, owner='old', shards=8)
+        )
+        cursors = {tenant.key: tenant.current_timestamp
+                   for tenant in old.tenants}
+
+        tenants = [poller.Tenant(token, '1') for token in tokens]
+        for tenant in tenants:
+            tenant.current_timestamp = cursors[tenant.key] + 3600
+        run_poller(
+            tenants, practicum, telegram_api,
+            leases=leases.LeaseStore(path, owner='new', shards=8),
+            statuses=status_index.StatusIndex(), overlap=60
+        )
+
+    after_handoff = practicum.requests[len(tokens):]
+    assert len(after_handoff) == len(tokens)
+    expected = {tenant.key: cursors[tenant.key] for tenant in tenants}
+    for token, query in after_handoff:
+        key = poller.Tenant(token, '1').key
+        assert int(query['from_date'][0]) == expected[key]
+
+
+def test_pollers_never_poll_tenant_twice(tmp_path):
+    import leases
+    import poller
+
+    tokens = [f'token-{number}' for number in range(20)]
+    path = str(tmp_path / 'leases.sqlite3')
+    with FakePracticum({token: [] for token in tokens}) as practicum, \
+            FakeTelegram() as telegram_api:
+        def node(owner):
+            return poller_engine(
+                [poller.Tenant(token, '1') for token in tokens], practicum,
+                telegram_api,
+                leases=leases.LeaseStore(path, owner=owner, shards=8)
+            )
+
+        with node('b') as second:
+            with node('a') as first:
+                asyncio.run(first.run_once())
+                asyncio.run(second.run_once())
+                assert len(practicum.requests) == len(tokens)
+
+            cursors = {
+                token: tenant.current_timestamp
+                for token, tenant in zip(tokens, first.tenants)
+            }
+            asyncio.run(second.run_once())
+
+    after_handoff = practicum.requests[len(tokens):]
+    assert len(after_handoff) == len(tokens)
+    for token, query in after_handoff:
+        assert int(query['from_date'][0]) == cursors[token]
+
+
+def test_workers_with_leases_poll_every_tenant(tmp_path, monkeypatch):
+    import leases
+    import logging_setup
+    import poller
+    import supervisor
+
+    tenants = [poller.Tenant(f'token-{number}', '1') for number in range(200)]
+    received = {}
+    monkeypatch.setattr(supervisor, 'LEASE_FILE', 'leases.sqlite3')
+    monkeypatch.setattr(supervisor.signal, 'signal', lambda *args: None)
+    monkeypatch.setattr(supervisor, 'start_worker_metrics', lambda index: None)
+    monkeypatch.setattr(logging_setup, 'setup_logging', lambda path: None)
+    monkeypatch.setattr(poller, 'load_tenants', lambda path: tenants)
+    monkeypatch.setattr(
+        poller, 'run',
+        lambda tenants, suffix, share: received.update({suffix: tenants})
+    )
+    for index in range(2):
+        supervisor.run_worker(index, 2)
+
+    path = str(tmp_path / 'leases.sqlite3')
+    nodes = [leases.LeaseStore(path, owner=f'w{index}', shards=16)
+             for index in range(2)]
+    for _ in range(2):
+        for node in nodes:
+            node.sync()
+    assert received == {'.0': tenants, '.1': tenants}
+    polled = [
+        tenant for tenant in tenants
+        if any(node.owns(tenant.key) for node in nodes)
+    ]
+    assert len(polled) == len(tenants)
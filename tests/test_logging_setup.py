@@ -0,0 +1,62 @@
+import json
+import logging
+
+
+def make_record(message, tenant=None):
+    record = logging.LogRecord(
+        'root', logging.DEBUG, __file__, 1, message, None, None
+    )
+    if tenant is not None:
+        record.tenant = tenant
+    return record
+
+
+def test_sample_filter_samples_per_tenant():
+    import constants
+    import logging_setup
+
+    sampler = logging_setup.SampleFilter(every=10)
+    passed = [
+        sampler.filter(make_record(constants.NO_NEW_STATUSES, tenant))
+        for _ in range(20) for tenant in ('a', 'b')
+    ]
+    assert sum(passed) == 4
+    assert all(sampler.filter(make_record('other')) for _ in range(5))
+
+
+def test_setup_logging_writes_json_lines_through_queue(tmp_path):
+    import logging_setup
+
+    path = tmp_path / 'homework.log'
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    listener = logging_setup.setup_logging(
+        path=str(path), level='INFO', json_lines=True
+    )
+    try:
+        logging.info('Привет', extra={'tenant': 'abc'})
+        logging.debug('Не попадет в лог')
+    finally:
+        logging_setup.stop_listener(listener)
+        root.handlers, root.level = handlers, level
+        for handler in listener.handlers:
+            handler.close()
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record['message'] == 'Привет'
+    assert record['tenant'] == 'abc'
+
+
+def test_file_handler_rotates_by_size(tmp_path):
+    import logging_setup
+
+    handler = logging_setup.create_file_handler(
+        str(tmp_path / 'homework.log'), max_bytes=100, backup_count=2
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    for _ in range(20):
+        handler.emit(make_record('x' * 40))
+    handler.close()
+    assert len(list(tmp_path.iterdir())) == 3
@@ -0,0 +1,62 @@
+import json
+import urllib.request
+
+
+def test_registry_renders_prometheus_text():
+    import metrics
+
+    registry = metrics.Registry()
+    counter = registry.counter('requests_total', 'Requests.')
+    counter.inc(status=200)
+    counter.inc(2, status=200)
+    histogram = registry.histogram('latency_seconds', 'Latency.', (0.1, 1))
+    histogram.observe(0.05, stage='fetch')
+    histogram.observe(5, stage='fetch')
+    registry.gauge('depth', 'Depth.').set_function(lambda: 7)
+
+    text = registry.render()
+    assert '# TYPE requests_total counter' in text
+    assert 'requests_total{status="200"} 3' in text
+    assert 'latency_seconds_bucket{stage="fetch",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="fetch",le="1"} 1' in text
+    assert 'latency_seconds_bucket{stage="fetch",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{stage="fetch"} 2' in text
+    assert 'depth 7' in text
+    assert registry.snapshot()['metrics']['depth'] == 7
+
+
+def test_homework_stages_are_timed():
+    import homework
+    import metrics
+
+    homework.parse_status({'homework_name': 'hw', 'status': 'approved'})
+    snapshot = metrics.REGISTRY.snapshot()['metrics']
+    assert snapshot['homework_stage_seconds_count{stage="parse_status"}'] >= 1
+
+
+def test_metrics_http_endpoint_and_snapshot(tmp_path):
+    import metrics
+
+    registry = metrics.Registry()
+    registry.counter('hits_total', 'Hits.').inc()
+    server = metrics.start_http_server(0, registry=registry)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(
+            f'http://127.0.0.1:{port}/metrics'
+        ) as response:
+            assert b'hits_total 1' in response.read()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    path = tmp_path / 'metrics.json'
+    stopped = metrics.start_snapshot_writer(str(path), 0.01, registry)
+    try:
+        for _ in range(100):
+            if path.exists():
+                break
+            stopped.wait(0.01)
+    finally:
+        stopped.set()
+    assert json.loads(path.read_text())['metrics']['hits_total'] == 1
@@ -0,0 +1,75 @@
+import asyncio
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import poller_engine, run_poller
+
+
+def test_outbox_survives_reopen(tmp_path):
+    import outbox
+
+    path = str(tmp_path / 'outbox.sqlite3')
+    queue = outbox.Outbox(path)
+    queue.enqueue_many([('1', 'a'), ('2', 'b'), ('1', 'c')])
+    queue.close()
+
+    queue = outbox.Outbox(path)
+    rows = queue.pending()
+    assert [(chat_id, text) for _, chat_id, text in rows] == [
+        ('1', 'a'), ('2', 'b'), ('1', 'c')
+    ]
+    queue.ack([rows[0][0]])
+    queue.retry_later([rows[1][0]])
+    assert len(queue) == 2
+    assert [text for _, _, text in queue.pending()] == ['c']
+    queue.close()
+
+
+def test_group_commit_batches_concurrent_enqueues(tmp_path):
+    import outbox
+
+    queue = outbox.Outbox(str(tmp_path / 'outbox.sqlite3'))
+
+    async def run_blocking(func, *args):
+        return func(*args)
+
+    async def run():
+        writer = outbox.GroupCommit(queue, run_blocking, window=0.01)
+        await asyncio.gather(
+            *(writer.add('1', str(number)) for number in range(100))
+        )
+
+    asyncio.run(run())
+    assert len(queue) == 100
+    assert queue.commits == 1
+    queue.close()
+
+
+def test_poller_keeps_messages_until_telegram_confirms(tmp_path):
+    import outbox
+    import poller
+
+    path = str(tmp_path / 'outbox.sqlite3')
+    homeworks = {'token': [{'homework_name': 'hw1', 'status': 'approved'}]}
+    with FakePracticum(homeworks) as practicum, \
+            FakeTelegram(failures=1) as telegram_api:
+        run_poller(
+            [poller.Tenant('token', '1')], practicum, telegram_api,
+            outbox=outbox.Outbox(path)
+        )
+
+        assert telegram_api.messages == []
+        queue = outbox.Outbox(path)
+        assert len(queue) == 1
+        queue.close()
+
+        with poller_engine(
+            [], practicum, telegram_api, outbox=outbox.Outbox(path)
+        ) as engine:
+            with engine.outbox._connection:
+                engine.outbox._connection.execute(
+                    'UPDATE outbox SET next_attempt_at = 0'
+                )
+            asyncio.run(engine.run_once())
+
+    assert len(telegram_api.messages) == 1
+    assert telegram_api.messages[0][1].endswith('Ура!')
@@ -0,0 +1,61 @@
+
+import pytest
+from fake_servers import FakePracticum, FakeTelegram
+from utils import run_poller
+
+
+@pytest.fixture
+def homeworks_by_token():
+    return {
+        'token-1': [{'homework_name': 'hw1', 'status': 'approved'}],
+        'token-2': [{'homework_name': 'hw2', 'status': 'rejected'}],
+        'token-3': [],
+    }
+
+
+def test_poller_run_once(homeworks_by_token):
+    import poller
+
+    with FakePracticum(homeworks_by_token) as practicum, \
+            FakeTelegram() as telegram_api:
+        tenants = [
+            poller.Tenant(token, str(chat_id))
+            for chat_id, token in enumerate(homeworks_by_token, start=1)
+        ]
+        run_poller(tenants, practicum, telegram_api)
+
+    assert sorted(telegram_api.messages) == [
+        ('1', 'Изменился статус проверки работы "hw1". '
+              'Работа проверена: ревьюеру всё понравилось. Ура!'),
+        ('2', 'Изменился статус проверки работы "hw2". '
+              'Работа проверена: у ревьюера есть замечания.'),
+    ]
+    assert len(practicum.requests) == 3
+
+
+def test_poller_bounds_in_flight_requests():
+    import poller
+
+    tokens = {f'token-{number}': [] for number in range(20)}
+    with FakePracticum(tokens, latency=0.05) as practicum, \
+            FakeTelegram() as telegram_api:
+        tenants = [poller.Tenant(token, '1') for token in tokens]
+        run_poller(tenants, practicum, telegram_api, max_in_flight=4)
+
+    assert len(practicum.requests) == 20
+    assert 1 < practicum.max_in_flight <= 4
+    assert telegram_api.messages == []
+
+
+def test_poller_reports_error_to_tenant_once():
+    import poller
+
+    with FakePracticum({}) as practicum, FakeTelegram() as telegram_api:
+        run_poller(
+            [poller.Tenant('bad-token', '7')], practicum, telegram_api,
+            cycles=2
+        )
+
+    assert len(telegram_api.messages) == 1
+    assert telegram_api.messages[0][0] == '7'
+    assert telegram_api.messages[0][1].startswith('Сбой в работе программы')
@@ -0,0 +1,90 @@
+import asyncio
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import FakeClock, run_poller
+
+
+def test_token_bucket_spaces_reservations():
+    import rate_limiter
+
+    clock = FakeClock()
+    bucket = rate_limiter.TokenBucket(rate=2, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0.5, 1.0]
+    clock.now = 10
+    assert bucket.reserve() == 0
+    bucket.pause(3)
+    assert bucket.reserve() == 3.5
+
+
+def test_scheduler_limits_per_chat_rate():
+    import rate_limiter
+
+    delivered = []
+
+    async def deliver(chat_id, message):
+        delivered.append((chat_id, message, asyncio.get_running_loop().time()))
+
+    async def run():
+        scheduler = rate_limiter.SendScheduler(deliver, chat_rate=10)
+        await asyncio.gather(
+            *(scheduler.send('1', str(number)) for number in range(3)),
+            scheduler.send('2', 'other'),
+        )
+        return scheduler.stats()
+
+    stats = asyncio.run(run())
+
+    chat_times = [at for chat_id, _, at in delivered if chat_id == '1']
+    assert [message for chat_id, message, _ in delivered
+            if chat_id == '1'] == ['0', '1', '2']
+    assert chat_times[2] - chat_times[0] >= 0.19
+    assert stats['sent'] == 4
+    assert stats['queued'] == 0
+    assert stats['wait_max'] >= 0.19
+
+
+def test_scheduler_pauses_all_chats_on_global_flood():
+    import rate_limiter
+
+    class RetryAfter(Exception):
+        retry_after = 0.3
+
+    flooded = {'1', '2'}
+    delivered = {}
+
+    async def deliver(chat_id, message):
+        if chat_id in flooded:
+            flooded.discard(chat_id)
+            raise RetryAfter()
+        delivered[chat_id] = asyncio.get_running_loop().time()
+
+    async def run():
+        scheduler = rate_limiter.SendScheduler(deliver, flood_chats=2)
+        started = asyncio.get_running_loop().time()
+
+        async def later():
+            await asyncio.sleep(0.05)
+            await scheduler.send('3', 'c')
+
+        await asyncio.gather(
+            scheduler.send('1', 'a'), scheduler.send('2', 'b'), later()
+        )
+        return scheduler, started
+
+    scheduler, started = asyncio.run(run())
+    assert scheduler.throttled == 2
+    assert delivered['3'] - started >= 0.3
+
+
+def test_poller_honors_retry_after():
+    import poller
+
+    homeworks = {'token': [{'homework_name': 'hw1', 'status': 'approved'}]}
+    with FakePracticum(homeworks) as practicum, \
+            FakeTelegram(flood_responses=1, retry_after=1) as telegram_api:
+        engine = run_poller(
+            [poller.Tenant('token', '1')], practicum, telegram_api
+        )
+
+    assert len(telegram_api.messages) == 1
+    assert engine.sender.stats()['throttled'] == 1
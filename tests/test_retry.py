@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from fake_servers import FakePracticum, FakeTelegram
+from utils import FakeClock, poller_engine
+
+
+def test_call_with_retry_retries_transient_errors_only():
+    import exceptions
+    import retry
+
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise exceptions.exception_retryable_error('502')
+        return 'ok'
+
+    delays = []
+    policy = retry.RetryPolicy(attempts=3, base_delay=1, max_delay=1.5)
+    assert retry.call_with_retry(
+        flaky, policy=policy, sleep=delays.append
+    ) == 'ok'
+    assert len(delays) == 2
+    assert 0.5 <= delays[0] <= 1 and 0.75 <= delays[1] <= 1.5
+
+    def fatal():
+        calls.append(1)
+        raise exceptions.exception_fatal_error('401')
+
+    calls.clear()
+    with pytest.raises(exceptions.exception_fatal_error):
+        retry.call_with_retry(fatal, policy=policy, sleep=delays.append)
+    assert len(calls) == 1
+
+
+def test_circuit_breaker_opens_and_probes():
+    import exceptions
+    import retry
+
+    clock = FakeClock()
+    breaker = retry.CircuitBreaker(failures=2, reset_timeout=30, clock=clock)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.on_failure()
+    assert breaker.state == retry.OPEN
+
+    with pytest.raises(exceptions.exception_circuit_open):
+        breaker.before_call()
+
+    clock.now = 31
+    breaker.before_call()
+    assert breaker.state == retry.HALF_OPEN
+    with pytest.raises(exceptions.exception_circuit_open):
+        breaker.before_call()
+    breaker.on_failure()
+    assert breaker.state == retry.OPEN
+
+    clock.now = 62
+    breaker.before_call()
+    breaker.on_success()
+    assert breaker.state == retry.CLOSED
+
+
+def test_cancelled_probe_releases_breaker():
+    import retry
+
+    clock = FakeClock()
+    breaker = retry.CircuitBreaker(failures=1, reset_timeout=30, clock=clock)
+    breaker.before_call()
+    breaker.on_failure()
+    clock.now = 31
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def fast():
+        return 'ok'
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                retry.acall_with_retry(slow, breaker=breaker), 0.05
+            )
+        assert breaker.state == retry.HALF_OPEN
+        return await retry.acall_with_retry(fast, breaker=breaker)
+
+    assert asyncio.run(run()) == 'ok'
+    assert breaker.state == retry.CLOSED
+
+    breaker.on_failure()
+    clock.now = 62
+
+    def broken():
+        raise ValueError('unexpected')
+
+    with pytest.raises(ValueError):
+        retry.call_with_retry(broken, breaker=breaker)
+    assert retry.call_with_retry(lambda: 'ok', breaker=breaker) == 'ok'
+
+
+def test_poller_recovers_from_transient_api_errors():
+    import poller
+    import retry
+
+    homeworks = {'token': [{'homework_name': 'hw1', 'status': 'approved'}]}
+    with FakePracticum(homeworks, failures=2) as practicum, \
+            FakeTelegram() as telegram_api:
+        with poller_engine(
+            [poller.Tenant('token', '1')], practicum, telegram_api
+        ) as engine:
+            engine.retry_policy = retry.RetryPolicy(base_delay=0.01)
+            asyncio.run(engine.run_once())
+
+    assert len(practicum.requests) == 3
+    assert len(telegram_api.messages) == 1
+    assert not telegram_api.messages[0][1].startswith('Сбой')
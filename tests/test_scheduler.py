@@ -0,0 +1,45 @@
+def make_tenant():
+    import poller
+
+    return poller.Tenant('token', '1')
+
+
+def test_schedule_polls_reviewing_works_more_often():
+    import scheduler
+    from homework_record import HomeworkRecord
+
+    schedule = scheduler.PollSchedule(base=600, minimum=60)
+    tenant = make_tenant()
+    assert schedule.interval(tenant) == 600
+
+    schedule.observe(tenant, [HomeworkRecord(1, status='reviewing')])
+    assert schedule.interval(tenant) == 60
+
+    schedule.observe(tenant, [HomeworkRecord(1, status='approved')])
+    assert schedule.interval(tenant) == 600
+
+
+def test_schedule_backs_off_for_idle_tenants():
+    import scheduler
+
+    schedule = scheduler.PollSchedule(
+        base=600, maximum=3600, idle_after=86400
+    )
+    tenant = make_tenant()
+    now = tenant.last_activity
+    assert schedule.interval(tenant, now + 86400 * 1.5) == 1200
+    assert schedule.interval(tenant, now + 86400 * 30) == 3600
+
+
+def test_schedule_deadlines_do_not_drift():
+    import scheduler
+
+    schedule = scheduler.PollSchedule(base=600, jitter=0)
+    tenant = make_tenant()
+    deadline = 1000
+    deadline = schedule.next_deadline(tenant, deadline, now=1005)
+    assert deadline == 1600
+    deadline = schedule.next_deadline(tenant, deadline, now=1700)
+    assert deadline == 2200
+    assert schedule.next_deadline(tenant, deadline, now=3000) == 3000
+    assert schedule.overruns == 1
@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+from os.path import abspath, dirname
+
+from fake_servers import FakePracticum, FakeTelegram
+
+ROOT = dirname(dirname(abspath(__file__)))
+IMPORT_BUDGET = 0.5
+
+IMPORT_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+import homework
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'elapsed': elapsed,
+    'lazy': [name for name in ('telegram', 'requests', 'asyncio')
+             if name not in sys.modules],
+}))
+'''
+
+
+def test_homework_import_is_fast_and_lazy():
+    result = subprocess.run(
+        [sys.executable, '-c', IMPORT_SCRIPT], cwd=ROOT,
+        check=True, capture_output=True, text=True, timeout=60
+    )
+    report = json.loads(result.stdout)
+    assert report['lazy'] == ['telegram', 'requests', 'asyncio']
+    assert report['elapsed'] < IMPORT_BUDGET
+
+
+def test_warm_up_opens_connections_and_caches_bot_name(monkeypatch):
+    import homework
+    import http_session
+    import poller
+
+    session = http_session.create_session()
+    with FakePracticum() as practicum, FakeTelegram() as telegram_api:
+        bot = poller.create_bot(
+            '999999:warm-up-token', base_url=telegram_api.base_url
+        )
+        monkeypatch.setattr(homework, 'get_session', lambda: session)
+        try:
+            homework.warm_up(bot, practicum.endpoint)
+            for _ in range(3):
+                homework.send_chat_message(bot, '1', 'text')
+        finally:
+            session.close()
+
+    assert telegram_api.methods.count('getMe') == 1
+    assert practicum.served == 1
@@ -0,0 +1,69 @@
+import asyncio
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import poller_engine
+
+
+def test_status_index_reports_transitions_only():
+    import status_index
+
+    index = status_index.StatusIndex()
+    assert index.is_changed('t:1', 'reviewing')
+    index.remember('t:1', 'reviewing')
+    assert not index.is_changed('t:1', 'reviewing')
+    assert index.is_changed('t:1', 'approved')
+
+
+def test_status_index_evicts_least_recently_used(tmp_path):
+    import status_index
+
+    path = str(tmp_path / 'statuses.json')
+    index = status_index.StatusIndex(max_size=2, path=path)
+    for key in ('t:1', 't:2', 't:3'):
+        index.remember(key, 'approved')
+    assert len(index) == 2
+    assert index.evictions == 1
+    assert index.is_changed('t:1', 'approved')
+    assert index.memory_usage() > 0
+
+    index.save()
+    reloaded = status_index.StatusIndex(path=path)
+    assert not reloaded.is_changed('t:3', 'approved')
+
+
+def test_status_index_evicts_expired(monkeypatch):
+    import status_index
+
+    index = status_index.StatusIndex(ttl=10)
+    index.remember('t:1', 'approved')
+    now = status_index.time.time()
+    monkeypatch.setattr(status_index.time, 'time', lambda: now + 60)
+    index.remember('t:2', 'approved')
+    assert len(index) == 1
+
+
+def test_poller_skips_repeated_statuses():
+    import poller
+    import status_index
+
+    homeworks = {'token': [
+        {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing'},
+    ]}
+    with FakePracticum(homeworks) as practicum, \
+            FakeTelegram() as telegram_api:
+        with poller_engine(
+            [poller.Tenant('token', '1')], practicum, telegram_api,
+            statuses=status_index.StatusIndex(), overlap=600
+        ) as engine:
+            asyncio.run(engine.run_once())
+            asyncio.run(engine.run_once())
+            homeworks['token'][0]['status'] = 'approved'
+            asyncio.run(engine.run_once())
+
+    assert [text[-30:] for _, text in telegram_api.messages] == [
+        'Работа взята на проверку ревьюером.'[-30:],
+        'Работа проверена: ревьюеру всё понравилось. Ура!'[-30:],
+    ]
+    first, second = (int(query['from_date'][0])
+                     for _, query in practicum.requests[:2])
+    assert second < first + 600
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import poller_engine, run_poller
+
+
+def test_load_tenants_merges_subscriptions(tmp_path):
+    import poller
+
+    path = tmp_path / 'tenants.json'
+    path.write_text(json.dumps([
+        {'practicum_token': 'token', 'chat_id': 1, 'subscribers': [2, 1]},
+        {'practicum_token': 'other', 'chat_id': 4},
+        {'practicum_token': 'token', 'chat_id': 3},
+    ]))
+
+    tenants = poller.load_tenants(str(path))
+    assert [tenant.chat_ids for tenant in tenants] == [[1, 2, 3], [4]]
+
+
+def test_poller_fans_out_status_once_per_token(monkeypatch):
+    import poller
+
+    rendered = []
+    parse_status = poller.parse_status
+    monkeypatch.setattr(
+        poller, 'parse_status',
+        lambda homework: rendered.append(homework) or parse_status(homework)
+    )
+    homeworks = [{'id': 1, 'homework_name': 'hw.zip', 'status': 'approved'}]
+    with FakePracticum({'token': homeworks}) as practicum, \
+            FakeTelegram() as telegram_api:
+        tenant = poller.Tenant('token', '1', subscribers=['2', '3'])
+        run_poller([tenant], practicum, telegram_api)
+
+    assert len(practicum.requests) == 1
+    assert len(rendered) == 1
+    assert sorted(chat for chat, _ in telegram_api.messages) == ['1', '2', '3']
+
+
+def test_failing_subscriber_does_not_block_owner():
+    import exceptions
+    import poller
+    import status_index
+
+    homeworks = [{'id': 1, 'homework_name': 'hw.zip', 'status': 'approved'}]
+    with FakePracticum({'token': homeworks}) as practicum, \
+            FakeTelegram() as telegram_api:
+        tenant = poller.Tenant('token', '1', subscribers=['2'])
+        with poller_engine(
+            [tenant], practicum, telegram_api,
+            statuses=status_index.StatusIndex()
+        ) as engine:
+            deliver = engine.sender.deliver
+
+            async def blocked_subscriber(chat_id, message):
+                if chat_id == '2':
+                    raise exceptions.exception_error('403. Forbidden')
+                return await deliver(chat_id, message)
+
+            engine.sender.deliver = blocked_subscriber
+            for _ in range(3):
+                asyncio.run(engine.run_once())
+
+    assert [chat for chat, _ in telegram_api.messages] == ['1']
+    assert telegram_api.messages[0][1].startswith('Изменился статус')
@@ -0,0 +1,90 @@
+import functools
+import os
+import sys
+import time
+
+
+def crash_once(directory, index, workers):
+    marker = os.path.join(directory, f'started-{index}')
+    if not os.path.exists(marker):
+        open(marker, 'w').close()
+        sys.exit(3)
+    open(os.path.join(directory, f'restarted-{index}'), 'w').close()
+    time.sleep(30)
+
+
+def test_hash_ring_moves_few_tenants():
+    import poller
+    import supervisor
+
+    tenants = [poller.Tenant(f'token-{number}', '1') for number in range(2000)]
+    before = supervisor.shard_tenants(tenants, 4)
+    after = supervisor.shard_tenants(tenants, 5)
+
+    owner = {
+        tenant.key: index
+        for index, shard in before.items() for tenant in shard
+    }
+    moved = [
+        tenant for index, shard in after.items() for tenant in shard
+        if owner[tenant.key] != index
+    ]
+    assert all(index == 4 for index, shard in after.items()
+               for tenant in shard if tenant in moved)
+    assert len(moved) < len(tenants) * 0.3
+    assert min(len(shard) for shard in before.values()) > 350
+
+
+def test_checkpoint_merge_keeps_latest_cursor(tmp_path):
+    import checkpoint
+
+    old = checkpoint.CheckpointStore(str(tmp_path / 'checkpoints.json.0'))
+    old.set('moved', 100)
+    old.set('stale', 500)
+    old.flush(force=True)
+
+    store = checkpoint.CheckpointStore(str(tmp_path / 'checkpoints.json.1'))
+    store.set('stale', 900)
+    store.merge([old.path, store.path, str(tmp_path / 'missing.json')])
+
+    assert store.get('moved') == 100
+    assert store.get('stale') == 900
+
+
+def test_supervisor_restarts_crashed_worker(tmp_path):
+    import supervisor
+
+    target = functools.partial(crash_once, str(tmp_path))
+    workers = supervisor.Supervisor(target, workers=2, restart_delay=0)
+    workers.start()
+    try:
+        deadline = time.monotonic() + 30
+        while workers.restarts < 2 and time.monotonic() < deadline:
+            time.sleep(0.1)
+            workers.check()
+        while workers.alive() < 2 and time.monotonic() < deadline:
+            time.sleep(0.1)
+    finally:
+        workers.stop(timeout=5)
+
+    assert workers.restarts == 2
+    assert workers.alive() == 0
+
+
+def test_supervisor_backs_off_crash_looping_worker():
+    import supervisor
+
+    workers = supervisor.Supervisor(
+        workers=1, restart_delay=1, max_restart_delay=10
+    )
+    workers._started_at[0] = 100
+    workers._died_at[0] = 101
+
+    delays = []
+    for _ in range(6):
+        delays.append(workers.delay(0))
+        workers._failures[0] = workers._failures.get(0, 0) + 1
+    assert delays == [1, 2, 4, 8, 10, 10]
+
+    workers._died_at[0] = 200
+    assert workers.delay(0) == 1
@@ -0,0 +1,152 @@
+import asyncio
+import gzip
+
+from fake_servers import FakePracticum, FakeTelegram
+from utils import poller_engine
+
+
+def test_capture_and_replay_round_trip(tmp_path):
+    import homework
+    import poller
+    import replay
+    import traffic
+
+    path = str(tmp_path / 'traffic.jsonl.gz')
+    homeworks_by_token = {
+        'token-1': [
+            {'id': 1, 'homework_name': 'hw1.zip', 'status': 'approved'},
+            {'id': 2, 'homework_name': 'hw2.zip', 'status': 'reviewing'},
+        ],
+    }
+    with FakePracticum(homeworks_by_token) as practicum, \
+            FakeTelegram() as telegram_api:
+        bot = poller.create_bot(
+            telegram_api.token, base_url=telegram_api.base_url
+        )
+        traffic.start_capture(path)
+        try:
+            for token in ('token-1', 'revoked-token'):
+                tenant = poller.Tenant(token, '5')
+                try:
+                    response = homework.request_api_answer(
+                        practicum.endpoint, tenant.headers, 0
+                    )
+                except homework.exception_error:
+                    continue
+                for record in homework.check_response(response):
+                    homework.send_chat_message(
+                        bot, '5', homework.parse_status(record)
+                    )
+        finally:
+            traffic.stop_capture()
+
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        content = file.read()
+    assert 'token-1' not in content
+
+    records = list(traffic.read_traffic(path))
+    assert [record['k'] for record in records] == ['api', 'tg', 'tg', 'api']
+    assert records[0]['u'] == poller.Tenant('token-1', '5').key
+    assert 'e' in records[3]
+
+    bot = replay.ReplayBot()
+    result = replay.Replay(bot, speed=0).run(records)
+
+    assert result['responses'] == 2
+    assert result['api_errors'] == 1
+    assert result['messages'] == 2
+    assert result['missing'] == result['unexpected'] == 0
+    assert [text for _, text in bot.messages] == [
+        text for _, text in telegram_api.messages
+    ]
+
+
+def capture_poller(path, practicum, telegram_api, rounds, **kwargs):
+    import poller
+    import traffic
+
+    with poller_engine(
+        [poller.Tenant('token-1', '5', subscribers=['6'])], practicum,
+        telegram_api, **kwargs
+    ) as engine:
+        traffic.start_capture(path)
+        try:
+            for change in rounds:
+                change()
+                asyncio.run(engine.run_once())
+        finally:
+            traffic.stop_capture()
+    return list(traffic.read_traffic(path))
+
+
+def test_replay_matches_poller_capture(tmp_path):
+    import replay
+
+    homeworks = [
+        {'id': 1, 'homework_name': 'hw1.zip', 'status': 'approved'},
+        {'id': 2, 'homework_name': 'hw2.zip', 'status': 'reviewing'},
+    ]
+    with FakePracticum({'token-1': homeworks}) as practicum, \
+            FakeTelegram() as telegram_api:
+        records = capture_poller(
+            str(tmp_path / 'traffic.jsonl'), practicum, telegram_api,
+            [lambda: None]
+        )
+
+    assert len(telegram_api.messages) == 2
+    result = replay.Replay(replay.ReplayBot(), speed=0).run(records)
+    assert result['messages'] == 2
+    assert result['missing'] == result['unexpected'] == 0
+
+
+def test_replay_matches_card_edits(tmp_path):
+    import cards
+    import replay
+
+    homework = {'id': 1, 'homework_name': 'hw1.zip', 'status': 'reviewing'}
+    with FakePracticum({'token-1': [homework]}) as practicum, \
+            FakeTelegram() as telegram_api:
+        records = capture_poller(
+            str(tmp_path / 'traffic.jsonl'), practicum, telegram_api,
+            [lambda: None, lambda: homework.update(status='approved')],
+            cards=cards.CardIndex()
+        )
+
+    assert len(telegram_api.edits) == 2
+    assert [record['k'] for record in records].count('tg') == 4
+    result = replay.Replay(replay.ReplayBot(), speed=0).run(records)
+    assert result['messages'] == 2
+    assert result['missing'] == result['unexpected'] == 0
+
+
+def test_replay_keeps_recorded_pauses(tmp_path):
+    import replay
+
+    now = [0.0]
+    pauses = []
+
+    def sleep(delay):
+        pauses.append(round(delay, 3))
+        now[0] += delay
+
+    records = [
+        {'k': 'api', 't': 100.0, 'd': 0.1, 'b': {'homeworks': []}},
+        {'k': 'api', 't': 102.0, 'd': 0.1, 'e': '502'},
+        {'k': 'api', 't': 106.0, 'd': 0.1, 'b': {'current_date': 1}},
+    ]
+    result = replay.Replay(
+        replay.ReplayBot(), speed=2, clock=lambda: now[0], sleep=sleep
+    ).run(records)
+
+    assert pauses == [1.0, 2.0]
+    assert result['recorded_seconds'] == 6
+    assert result['invalid'] == 1
+
+
+def test_read_traffic_skips_torn_line(tmp_path):
+    import traffic
+
+    path = tmp_path / 'traffic.jsonl'
+    path.write_text('{"k":"tg","t":1,"d":0,"c":"5","m":"x"}\n{"k":"ap')
+
+    assert len(list(traffic.read_traffic(str(path)))) == 1
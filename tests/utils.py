@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import contextmanager
 from inspect import signature
 from types import ModuleType
 
@@ -37,3 +39,35 @@ def check_default_var_exists(scope: ModuleType, var_name: str) -> None:
         f'{var_name} должна быть переменной, а не функцией.'
     )
 
+
+class FakeClock:
+    """Clock for time-dependent code: call it to get `now`, set `now`."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@contextmanager
+def poller_engine(tenants, practicum, telegram_api, **kwargs):
+    """Poller for tenants against fake servers, closed on exit."""
+    import poller
+
+    bot = poller.create_bot(telegram_api.token, base_url=telegram_api.base_url)
+    engine = poller.Poller(
+        tenants, bot, endpoint=practicum.endpoint, **kwargs
+    )
+    try:
+        yield engine
+    finally:
+        engine.close()
+
+
+def run_poller(tenants, practicum, telegram_api, cycles=1, **kwargs):
+    """Run `cycles` polling rounds and return the closed poller."""
+    with poller_engine(tenants, practicum, telegram_api, **kwargs) as engine:
+        for _ in range(cycles):
+            asyncio.run(engine.run_once())
+    return engine
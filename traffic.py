@@ -0,0 +1,90 @@
+import gzip
+import json
+import logging
+import threading
+import time
+
+_recorder = None
+
+
+class TrafficRecorder:
+    """
+    Запись обмена с API Практикума и телеграммом в файл,.
+    одна строка JSON на вызов, файл только дописывается.
+    Файл с расширением .gz пишется сжатым.
+    """
+
+    def __init__(self, path):
+        """Файл path открывается на дозапись."""
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        opener = gzip.open if path.endswith('.gz') else open
+        self._file = opener(path, 'at', encoding='utf-8')
+
+    def write(self, kind, started, **fields):
+        """Записать вызов, начатый в момент started по time.time()."""
+        record = {
+            'k': kind,
+            't': round(started, 3),
+            'd': round(time.time() - started, 3),
+            **fields,
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        """Закрыть файл записи."""
+        with self._lock:
+            self._file.close()
+
+
+def traffic_path(path, index):
+    """Файл записи процесса-обработчика index, расширение .gz сохраняется."""
+    if path.endswith('.gz'):
+        return f'{path[:-len(".gz")]}.{index}.gz'
+    return f'{path}.{index}'
+
+
+def start_capture(path):
+    """Включить запись обмена в path."""
+    global _recorder
+    stop_capture()
+    _recorder = TrafficRecorder(path)
+    return _recorder
+
+
+def stop_capture():
+    """Выключить запись обмена."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.close()
+
+
+def capturing():
+    """Включена ли запись обмена."""
+    return _recorder is not None
+
+
+def capture(kind, started, **fields):
+    """Записать вызов, если запись включена."""
+    recorder = _recorder
+    if recorder is not None:
+        recorder.write(kind, started, **fields)
+
+
+def read_traffic(path):
+    """Записи из файла по одной, в порядке записи."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logging.warning(f'{path}:{number}: оборванная запись!')